@@ -1,13 +1,18 @@
 from fastapi import FastAPI
 from dotenv import load_dotenv
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from fastapi.middleware.cors import CORSMiddleware
 from src.db import events
 
 import os
+import asyncio
 from src.errors import register_all_errors
-from src.middleware import register_middleware
-from src.db.database import create_tables
+from src.middleware import register_middleware, log_listener
+from src.db.database import create_tables, warm_pool
+from src.utils.s3 import close_s3_client
+from src.utils.file_to_s3 import close_telegram_session
+from src.utils.auth import start_hash_pool, shutdown_hash_pool
+from src.services.outbox import run_outbox_worker
 from src.routers import users, submissions, status, telegram, projects, reviewer, agent
 
 load_dotenv()
@@ -31,9 +36,21 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"Error connecting to Redis: {e}")
 
+    log_listener.start()
     await create_tables()
+    await warm_pool()
+    start_hash_pool()
+    outbox_worker = asyncio.create_task(run_outbox_worker())
     yield
 
+    outbox_worker.cancel()
+    with suppress(asyncio.CancelledError):
+        await outbox_worker
+    await close_s3_client()
+    await close_telegram_session()
+    shutdown_hash_pool()
+    log_listener.stop()
+
 
 
 app = FastAPI(
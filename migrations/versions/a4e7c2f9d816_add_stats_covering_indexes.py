@@ -0,0 +1,47 @@
+"""add stats covering indexes
+
+Revision ID: a4e7c2f9d816
+Revises: c8f4a1d6e392
+Create Date: 2026-10-16 18:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e7c2f9d816'
+down_revision: Union[str, None] = 'c8f4a1d6e392'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Covering indexes for the contributor / reviewer stats queries."""
+    op.create_index(
+        'ix_submission_user_created', 'submission', ['user_id', 'created_at'],
+        postgresql_include=['status', 'assignment_id', 'type'],
+    )
+    op.create_index(
+        'ix_coinpayment_user_project', 'coinpayment', ['user_id', 'project_id'],
+        postgresql_include=['coins_earned'],
+    )
+    op.create_index(
+        'ix_review_reviewer_created', 'review', ['reviewer_id', 'created_at'],
+        postgresql_include=['decision', 'submission_id'],
+    )
+    op.create_index(
+        'ix_reviewerallocation_reviewer_assigned', 'reviewerallocation', ['reviewer_id', 'assigned_at'],
+        postgresql_include=['submission_id', 'status'],
+    )
+    # Fresh statistics so the planner picks the new indexes straight away
+    op.execute("ANALYZE submission, coinpayment, review, reviewerallocation")
+
+
+def downgrade() -> None:
+    """Drop the stats covering indexes."""
+    op.drop_index('ix_reviewerallocation_reviewer_assigned', table_name='reviewerallocation')
+    op.drop_index('ix_review_reviewer_created', table_name='review')
+    op.drop_index('ix_coinpayment_user_project', table_name='coinpayment')
+    op.drop_index('ix_submission_user_created', table_name='submission')
@@ -0,0 +1,35 @@
+"""add coinpayment unique indexes
+
+Revision ID: a9c3e6f1b285
+Revises: f2b7d9e4a613
+Create Date: 2026-10-16 13:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c3e6f1b285'
+down_revision: Union[str, None] = 'f2b7d9e4a613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """One coin payment per (user, allocation) (fails if duplicate payments exist; remove those first)."""
+    op.create_index(
+        'ux_coinpayment_user_agent_allocation', 'coinpayment',
+        ['user_id', 'agent_allocation_id'], unique=True,
+    )
+    op.create_index(
+        'ux_coinpayment_user_reviewer_allocation', 'coinpayment',
+        ['user_id', 'reviewer_allocation_id'], unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Drop the coin payment unique indexes."""
+    op.drop_index('ux_coinpayment_user_reviewer_allocation', table_name='coinpayment')
+    op.drop_index('ux_coinpayment_user_agent_allocation', table_name='coinpayment')
@@ -0,0 +1,31 @@
+"""add task and allocation lookup indexes
+
+Revision ID: b5d1f8c3e720
+Revises: a9c3e6f1b285
+Create Date: 2026-10-16 14:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d1f8c3e720'
+down_revision: Union[str, None] = 'a9c3e6f1b285'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index allocator lookups and make (task, user) allocations unique (fails if duplicates exist; dedupe those first)."""
+    op.create_index('ix_task_project_prompt', 'task', ['project_id', 'prompt_id'], unique=False)
+    op.create_index('ix_alloc_project_user', 'agentallocation', ['project_id', 'user_id'], unique=False)
+    op.create_unique_constraint('uq_alloc_task_user', 'agentallocation', ['task_id', 'user_id'])
+
+
+def downgrade() -> None:
+    """Drop the allocator lookup indexes."""
+    op.drop_constraint('uq_alloc_task_user', 'agentallocation', type_='unique')
+    op.drop_index('ix_alloc_project_user', table_name='agentallocation')
+    op.drop_index('ix_task_project_prompt', table_name='task')
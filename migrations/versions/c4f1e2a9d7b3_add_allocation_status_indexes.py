@@ -0,0 +1,33 @@
+"""add allocation and submission status indexes
+
+Revision ID: c4f1e2a9d7b3
+Revises: 6d3aa9a575dc
+Create Date: 2026-10-16 11:45:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f1e2a9d7b3'
+down_revision: Union[str, None] = '6d3aa9a575dc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index the (owner, status) filters used by allocation/submission listings."""
+    op.create_index('ix_agentallocation_user_id_status', 'agentallocation', ['user_id', 'status'])
+    op.create_index('ix_reviewerallocation_reviewer_id_status', 'reviewerallocation', ['reviewer_id', 'status'])
+    op.create_index('ix_submission_user_id_status', 'submission', ['user_id', 'status'])
+    op.create_index('ix_submission_assignment_id', 'submission', ['assignment_id'])
+
+
+def downgrade() -> None:
+    """Drop the status indexes."""
+    op.drop_index('ix_submission_assignment_id', table_name='submission')
+    op.drop_index('ix_submission_user_id_status', table_name='submission')
+    op.drop_index('ix_reviewerallocation_reviewer_id_status', table_name='reviewerallocation')
+    op.drop_index('ix_agentallocation_user_id_status', table_name='agentallocation')
@@ -0,0 +1,38 @@
+"""store coins_earned as micro-coins
+
+Revision ID: c8f4a1d6e392
+Revises: e3b8c6d2f147
+Create Date: 2026-10-16 17:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f4a1d6e392'
+down_revision: Union[str, None] = 'e3b8c6d2f147'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Convert coins_earned from float coins to BIGINT micro-coins (coins x 1_000_000)."""
+    op.alter_column(
+        'coinpayment', 'coins_earned',
+        type_=sa.BigInteger(),
+        existing_type=sa.Float(),
+        existing_nullable=False,
+        postgresql_using='round(coins_earned * 1000000)::bigint',
+    )
+
+
+def downgrade() -> None:
+    """Back to float coins."""
+    op.alter_column(
+        'coinpayment', 'coins_earned',
+        type_=sa.Float(),
+        existing_type=sa.BigInteger(),
+        existing_nullable=False,
+        postgresql_using='coins_earned / 1000000.0',
+    )
@@ -0,0 +1,46 @@
+"""add project_id to reviewerallocation
+
+Revision ID: d2b9e5a7c031
+Revises: a4e7c2f9d816
+Create Date: 2026-10-16 19:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b9e5a7c031'
+down_revision: Union[str, None] = 'a4e7c2f9d816'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Denormalize the project onto reviewer allocations for the auto-assign workload count."""
+    op.add_column('reviewerallocation', sa.Column('project_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.create_foreign_key(
+        'reviewerallocation_project_id_fkey', 'reviewerallocation', 'project', ['project_id'], ['id']
+    )
+    # Backfill existing rows from their submission's task
+    op.execute(
+        """
+        UPDATE reviewerallocation AS ra
+        SET project_id = task.project_id
+        FROM submission
+        JOIN task ON task.id = submission.task_id
+        WHERE submission.id = ra.submission_id
+        """
+    )
+    op.create_index(
+        'ix_reviewerallocation_project_reviewer', 'reviewerallocation', ['project_id', 'reviewer_id']
+    )
+    op.execute("ANALYZE reviewerallocation")
+
+
+def downgrade() -> None:
+    """Drop the denormalized project_id."""
+    op.drop_index('ix_reviewerallocation_project_reviewer', table_name='reviewerallocation')
+    op.drop_constraint('reviewerallocation_project_id_fkey', 'reviewerallocation', type_='foreignkey')
+    op.drop_column('reviewerallocation', 'project_id')
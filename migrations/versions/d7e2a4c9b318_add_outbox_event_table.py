@@ -0,0 +1,43 @@
+"""add outbox event table
+
+Revision ID: d7e2a4c9b318
+Revises: b5d1f8c3e720
+Create Date: 2026-10-16 15:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e2a4c9b318'
+down_revision: Union[str, None] = 'b5d1f8c3e720'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the outbox table and its pending-events index."""
+    op.create_table(
+        'outboxevent',
+        sa.Column('id', postgresql.VARCHAR(), nullable=False),
+        sa.Column('event_type', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_outboxevent_pending', 'outboxevent', ['created_at'], unique=False,
+        postgresql_where=sa.text('processed_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Drop the outbox table."""
+    op.drop_index('ix_outboxevent_pending', table_name='outboxevent', postgresql_where=sa.text('processed_at IS NULL'))
+    op.drop_table('outboxevent')
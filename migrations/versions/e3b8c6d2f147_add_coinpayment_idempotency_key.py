@@ -0,0 +1,47 @@
+"""add coinpayment idempotency key
+
+Revision ID: e3b8c6d2f147
+Revises: d7e2a4c9b318
+Create Date: 2026-10-16 16:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b8c6d2f147'
+down_revision: Union[str, None] = 'd7e2a4c9b318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add idempotency_key, backfill it for existing payments and make it the unique key."""
+    op.add_column('coinpayment', sa.Column('idempotency_key', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.execute(
+        """
+        UPDATE coinpayment SET idempotency_key = CASE
+            WHEN agent_allocation_id IS NOT NULL THEN 'agent:' || user_id || ':' || agent_allocation_id
+            WHEN reviewer_allocation_id IS NOT NULL THEN 'reviewer:' || user_id || ':' || reviewer_allocation_id
+        END
+        """
+    )
+    op.create_index('ux_coinpayment_idempotency_key', 'coinpayment', ['idempotency_key'], unique=True)
+    op.drop_index('ux_coinpayment_user_reviewer_allocation', table_name='coinpayment')
+    op.drop_index('ux_coinpayment_user_agent_allocation', table_name='coinpayment')
+
+
+def downgrade() -> None:
+    """Go back to the per-allocation unique indexes."""
+    op.create_index(
+        'ux_coinpayment_user_agent_allocation', 'coinpayment',
+        ['user_id', 'agent_allocation_id'], unique=True,
+    )
+    op.create_index(
+        'ux_coinpayment_user_reviewer_allocation', 'coinpayment',
+        ['user_id', 'reviewer_allocation_id'], unique=True,
+    )
+    op.drop_index('ux_coinpayment_idempotency_key', table_name='coinpayment')
+    op.drop_column('coinpayment', 'idempotency_key')
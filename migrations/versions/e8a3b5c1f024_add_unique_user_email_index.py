@@ -0,0 +1,30 @@
+"""add unique user email index
+
+Revision ID: e8a3b5c1f024
+Revises: c4f1e2a9d7b3
+Create Date: 2026-10-16 12:05:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a3b5c1f024'
+down_revision: Union[str, None] = 'c4f1e2a9d7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Make non-null user emails unique (fails if duplicates exist; dedupe those first)."""
+    op.create_index(
+        'ux_user_email', 'user', ['email'],
+        unique=True, postgresql_where=sa.text('email IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Drop the unique email index."""
+    op.drop_index('ux_user_email', table_name='user')
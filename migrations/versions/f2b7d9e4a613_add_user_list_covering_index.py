@@ -0,0 +1,30 @@
+"""add user list covering index
+
+Revision ID: f2b7d9e4a613
+Revises: e8a3b5c1f024
+Create Date: 2026-10-16 12:30:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7d9e4a613'
+down_revision: Union[str, None] = 'e8a3b5c1f024'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Covering index for GET /user/all/users (keyset on created_at, id)."""
+    op.create_index(
+        'ix_user_list_cover', 'user', ['created_at', 'id'],
+        postgresql_include=['name', 'email', 'role'],
+    )
+
+
+def downgrade() -> None:
+    """Drop the user list covering index."""
+    op.drop_index('ix_user_list_cover', table_name='user')
@@ -1,10 +1,14 @@
 # database.py
 import os
+import asyncio
+from uuid import uuid4
 from dotenv import load_dotenv
 from sqlmodel import SQLModel
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 load_dotenv()
 
@@ -12,19 +16,65 @@ DATABASE_URL_ASYNC = os.getenv("DATABASE_URL_ASYNC")
 
 DATABASE_URL = DATABASE_URL_ASYNC
 
+# Pool sizing: the SQLAlchemy default (5 + 10 overflow) makes concurrent requests
+# queue on connection checkout well before Postgres itself is busy.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Connections opened at startup so the first requests don't pay the connect cost
+DB_POOL_WARM = int(os.getenv("DB_POOL_WARM", str(DB_POOL_SIZE)))
+
+# Behind PgBouncer in transaction mode, asyncpg's prepared statement caches must be off
+# and statement names unique (a statement may run on a different server connection than
+# the one it was prepared on), and PgBouncer does the pooling, so SQLAlchemy opens a
+# fresh connection per checkout. PgBouncer also rejects most startup parameters.
+DB_USE_PGBOUNCER = os.getenv("DB_USE_PGBOUNCER", "false").lower() == "true"
+
+# Server-side cap on any single statement (ms, 0 disables): a runaway query gets
+# cancelled instead of holding a pooled connection indefinitely
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "60000"))
+
 
 # Convert URL to async driver
 # url_obj = make_url(DATABASE_URL)
 # ASYNC_DATABASE_URL = str(url_obj.set(drivername="postgresql+asyncpg"))
 
 
+if DB_USE_PGBOUNCER:
+    pool_options = {
+        "poolclass": NullPool,
+        "connect_args": {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    }
+else:
+    pool_options = {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_pre_ping": True,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "connect_args": {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}},
+    }
+
 # Create async engine
 engine = create_async_engine(
     DATABASE_URL,
     echo=True,  # enable logging to debug
-    pool_pre_ping=True
+    **pool_options,
 )
 
+if DB_USE_PGBOUNCER:
+    # No startup parameters through PgBouncer, and a session-level SET would leak to
+    # whichever client gets the server connection next: apply the timeout per transaction
+    @event.listens_for(engine.sync_engine, "begin")
+    def _set_local_statement_timeout(conn):
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {DB_STATEMENT_TIMEOUT_MS}")
+
 # Async session factory
 # async_session_maker = sessionmaker(
 #     bind=engine,
@@ -41,6 +91,28 @@ async def get_session():
     async with async_session_maker() as session:
         yield session
 
+
+async def run_out_of_band(statement):
+    """Execute a read-only statement on its own pooled session.
+
+    An AsyncSession runs one statement at a time, so independent reads that should
+    go out concurrently (e.g. under asyncio.gather) each need their own session.
+    The returned result is fully buffered and stays usable after the session closes.
+    """
+    async with async_session_maker() as session:
+        return await session.execute(statement)
+
+async def warm_pool():
+    """Open DB_POOL_WARM connections up front and hand them back to the pool."""
+    if DB_USE_PGBOUNCER:
+        return  # NullPool keeps nothing, PgBouncer holds the warm connections
+
+    # Hold them all until every one is open, otherwise checkouts just reuse each other
+    count = min(DB_POOL_WARM, DB_POOL_SIZE)
+    connections = await asyncio.gather(*(engine.connect().start() for _ in range(count)))
+    await asyncio.gather(*(connection.close() for connection in connections))
+    print(f"✅ Database pool warmed with {count} connections")
+
 # Create tables
 async def create_tables():
     async with engine.begin() as conn:
@@ -1,9 +1,9 @@
 from typing import Optional, List, Dict
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy import String
+from sqlalchemy import BigInteger, String, Index, UniqueConstraint, text as sa_text
 from sqlalchemy.orm import relationship as sa_relationship
 from sqlmodel import SQLModel, Field, Relationship, Column
 import sqlalchemy.dialects.postgresql as pg
@@ -17,7 +17,8 @@ def generate_uuid() -> str:
 
 
 def utcnow() -> datetime:
-    return datetime.utcnow()
+    # Naive UTC, matching the TIMESTAMP WITHOUT TIME ZONE columns (utcnow() is deprecated)
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
 # ----------------------------
@@ -144,6 +145,13 @@ class Prompt(SQLModel, table=True):
 
 
 class User(SQLModel, table=True):
+    __table_args__ = (
+        # Emails identify users (login, bulk upload upserts); NULL emails stay allowed
+        Index("ux_user_email", "email", unique=True, postgresql_where=sa_text("email IS NOT NULL")),
+        # Covers the admin user list (keyset order + listed columns) for index-only scans
+        Index("ix_user_list_cover", "created_at", "id", postgresql_include=["name", "email", "role"]),
+    )
+
     id: Optional[str] = Field(sa_column=Column(pg.VARCHAR, primary_key=True, default=generate_uuid))
     name: Optional[str] = None
     email: Optional[str] = None
@@ -188,6 +196,11 @@ class Task(SQLModel, table=True):
     Task = an allocation generated from a Prompt and Project.
     Usually one Task corresponds to one Prompt being allocated to someone (but remains a separate entity).
     """
+    __table_args__ = (
+        # Allocator looks tasks up by (project_id, prompt_id); not unique, Excel uploads add one task per row
+        Index("ix_task_project_prompt", "project_id", "prompt_id"),
+    )
+
     id: Optional[str] = Field(sa_column=Column(pg.VARCHAR, primary_key=True, default=generate_uuid))
     project_id: str = Field(foreign_key="project.id")
     prompt_id: Optional[str] = Field(default=None, foreign_key="prompt.id")
@@ -236,6 +249,14 @@ class AgentAllocation(SQLModel, table=True):
     A single allocation of a Task (prompt) to a User.
     A AgentAllocation can have one Submission.
     """
+    __table_args__ = (
+        Index("ix_agentallocation_user_id_status", "user_id", "status"),
+        # Allocator counts allocations per user within a project
+        Index("ix_alloc_project_user", "project_id", "user_id"),
+        # A task is allocated to a given user at most once
+        UniqueConstraint("task_id", "user_id", name="uq_alloc_task_user"),
+    )
+
     id: Optional[str] = Field(sa_column=Column(pg.VARCHAR, primary_key=True, default=generate_uuid))
     project_id: str = Field(foreign_key="project.id")
     task_id: str = Field(foreign_key="task.id")
@@ -260,9 +281,19 @@ class AgentAllocation(SQLModel, table=True):
 
 
 class ReviewerAllocation(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_reviewerallocation_reviewer_id_status", "reviewer_id", "status"),
+        # Reviewer stats: index-only scan by reviewer and assigned_at window
+        Index("ix_reviewerallocation_reviewer_assigned", "reviewer_id", "assigned_at", postgresql_include=["submission_id", "status"]),
+        # Auto-assign workload count: index-only scan per (project, reviewer)
+        Index("ix_reviewerallocation_project_reviewer", "project_id", "reviewer_id"),
+    )
+
     id: Optional[str] = Field(sa_column=Column(pg.VARCHAR, primary_key=True, default=generate_uuid))
     submission_id: str = Field(foreign_key="submission.id", nullable=False)
     reviewer_id: str = Field(foreign_key="user.id", nullable=False)
+    # Copy of submission.task.project_id so per-project workload skips the joins
+    project_id: Optional[str] = Field(default=None, foreign_key="project.id")
     status: Status = Field(default=Status.pending)
     assigned_at: datetime = Field(default_factory=datetime.utcnow)
     reviewed_at: Optional[datetime] = None
@@ -304,6 +335,13 @@ class Submission(SQLModel, table=True):
     """
     Unified Submission model. Each submission is linked to a single AgentAllocation.
     """
+    __table_args__ = (
+        Index("ix_submission_user_id_status", "user_id", "status"),
+        Index("ix_submission_assignment_id", "assignment_id"),
+        # Contributor stats: index-only scan by user and created_at window
+        Index("ix_submission_user_created", "user_id", "created_at", postgresql_include=["status", "assignment_id", "type"]),
+    )
+
     id: Optional[str] = Field(sa_column=Column(pg.VARCHAR, primary_key=True, default=generate_uuid))
     task_id: str = Field(foreign_key="task.id")
     # This foreign key establishes the "many-to-one" side of the relationship.
@@ -345,6 +383,11 @@ class Review(SQLModel, table=True):
     Review / scoring for a submission.
     One submission can have multiple reviews (AI/human/super).
     """
+    __table_args__ = (
+        # Reviewer stats: index-only scan by reviewer and created_at window
+        Index("ix_review_reviewer_created", "reviewer_id", "created_at", postgresql_include=["decision", "submission_id"]),
+    )
+
     id: Optional[str] = Field(sa_column=Column(pg.VARCHAR, primary_key=True, default=generate_uuid))
     submission_id: str = Field(foreign_key="submission.id")
     reviewer_id: str = Field(foreign_key="user.id")
@@ -364,6 +407,14 @@ class Review(SQLModel, table=True):
 
 
 class CoinPayment(SQLModel, table=True):
+    __table_args__ = (
+        # One payment per key ("agent:<user>:<allocation>" / "reviewer:<user>:<allocation>"):
+        # the payment services insert with ON CONFLICT (idempotency_key) DO NOTHING
+        Index("ux_coinpayment_idempotency_key", "idempotency_key", unique=True),
+        # Per-project coin totals for a user, read from the index alone
+        Index("ix_coinpayment_user_project", "user_id", "project_id", postgresql_include=["coins_earned"]),
+    )
+
     id: Optional[str] = Field(sa_column=Column(pg.VARCHAR, primary_key=True, default=generate_uuid))
     user_id: str = Field(foreign_key="user.id")
     task_id: Optional[str] = Field(foreign_key="task.id")
@@ -379,8 +430,10 @@ class CoinPayment(SQLModel, table=True):
 
     project_id: Optional[str] = Field(foreign_key="project.id")
 
-    coins_earned: float
+    # Micro-coins (coins x 1_000_000) so ledger sums stay exact; see src/services/coins.py
+    coins_earned: int = Field(sa_column=Column(BigInteger, nullable=False))
     approved: bool = Field(default=False)
+    idempotency_key: Optional[str] = None
 
     user: User = Relationship(back_populates="coins_earned")
     task: Optional[Task] = Relationship(back_populates="coin_payments")
@@ -402,3 +455,24 @@ class AuditLog(SQLModel, table=True):
     created_at: datetime = Field(default_factory=utcnow)
     updated_at: datetime = Field(default_factory=utcnow, sa_column_kwargs={"onupdate": utcnow})
 
+
+
+class OutboxEvent(SQLModel, table=True):
+    """
+    Work written in the same transaction as the change that caused it
+    (e.g. coin awards on review) and carried out later by the outbox worker.
+    """
+    __table_args__ = (
+        # The worker only ever scans pending events, oldest first
+        Index("ix_outboxevent_pending", "created_at", postgresql_where=sa_text("processed_at IS NULL")),
+    )
+
+    id: Optional[str] = Field(sa_column=Column(pg.VARCHAR, primary_key=True, default=generate_uuid))
+    event_type: str
+    payload: Dict = Field(default_factory=dict, sa_column=Column(JSONB))
+
+    attempts: int = Field(default=0)
+    last_error: Optional[str] = None
+    processed_at: Optional[datetime] = None
+
+    created_at: datetime = Field(default_factory=utcnow)
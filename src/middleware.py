@@ -7,7 +7,9 @@ from colorlog import ColoredFormatter
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError
-import time, json, logging, traceback
+import time, json, logging, traceback, queue
+from logging.handlers import QueueHandler, QueueListener
+from src.utils.pagination import NEXT_CURSOR_HEADER
 
 
 
@@ -37,11 +39,16 @@ console_handler.setFormatter(console_formatter)
 file_handler = logging.FileHandler("app.log")
 file_handler.setFormatter(file_formatter)
 
-# Logger setup
+# Loggers only put records on a queue; the listener thread (started by the app
+# lifespan) does the console / app.log writes, off the event loop
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, console_handler, file_handler)
+
+# Logger setup: the middleware logger and every module logger under src.*
 logger = logging.getLogger("aiforgov.middleware")
-logger.setLevel(logging.INFO)
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
+for app_logger in (logger, logging.getLogger("src")):
+    app_logger.setLevel(logging.INFO)
+    app_logger.addHandler(QueueHandler(log_queue))
 
 
 allowed_origins = [
@@ -137,7 +144,7 @@ def register_middleware(app: FastAPI):
         return response
 
 
-    app.add_middleware(CORSMiddleware, allow_origins=allowed_origins, allow_methods=["*"], allow_headers=["*"], allow_credentials=True,)
+    app.add_middleware(CORSMiddleware, allow_origins=allowed_origins, allow_methods=["*"], allow_headers=["*"], allow_credentials=True, expose_headers=[NEXT_CURSOR_HEADER],)
     from fastapi import FastAPI
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
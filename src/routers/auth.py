@@ -8,7 +8,7 @@ from src.db.models import User
 from src.db.database import get_session
 from src.config import ACCESS_TOKEN_EXPIRE_MINUTES
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.utils.auth import verify_password, get_password_hash, create_access_token, decode_access_token
+from src.utils.auth import verify_password_async, get_password_hash_async, create_access_token, decode_access_token
 
 router = APIRouter()
 
@@ -24,7 +24,7 @@ async def register_user(*, user_create: UserCreate, session: AsyncSession = Depe
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_password = get_password_hash(user_create.password)
+    hashed_password = await get_password_hash_async(user_create.password)
     user = User(
         name=user_create.name,
         email=user_create.email,
@@ -37,15 +37,15 @@ async def register_user(*, user_create: UserCreate, session: AsyncSession = Depe
         telegram_id=user_create.telegram_id
     )
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
     return user
 
 @router.post("/signin", response_model=Token)
 async def login_for_access_token(form_data: UserLogin, session: AsyncSession = Depends(get_session)):
     result = await session.execute(select(User).where(User.email == form_data.email))
     user = result.scalars().first()
-    if not user or not verify_password(form_data.password, user.password):
+    if not user or not await verify_password_async(form_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -6,11 +6,13 @@ from sqlalchemy.orm import selectinload
 from fastapi import Path
 import uuid
 from collections import defaultdict
+from functools import partial
 from datetime import datetime
 
 
 from src.db.database import get_session
 from src.utils.build_task_details import build_task_details
+from src.services.coins import invalidate_project_coins
 from src.db.models import Project, AgentAllocation, Status, Task, Submission, ReviewerAllocation, CoinPayment, User, Role, ProjectReviewer, Review
 from src.schemas.project_schemas import (
     ProjectCreate,
@@ -147,6 +149,7 @@ async def update_project(project_id: str, project_in: ProjectUpdate, session: As
 
         session.add(proj)
         await session.commit()
+        invalidate_project_coins(project_id)
         await session.refresh(proj)
         return proj
     except Exception as e:
@@ -578,9 +581,16 @@ async def list_project_tasks_general(
                     selectinload(Submission.review_allocations)
                         .selectinload(ReviewerAllocation.reviewer),
                 ),
+            # Reviewer section reads reviews/review allocations through Task.submissions:
+            # preload them here too, for submissions not reached via an allocation
             selectinload(Project.tasks)
                 .selectinload(Task.submissions)
-                .selectinload(Submission.user),
+                .options(
+                    selectinload(Submission.user),
+                    selectinload(Submission.reviews),
+                    selectinload(Submission.review_allocations)
+                        .selectinload(ReviewerAllocation.reviewer),
+                ),
         )
         .where(Project.id == project_id)
     )
@@ -628,7 +638,8 @@ async def list_project_tasks_general(
                     review_info = ReviewInfo(reviewers=reviewers)
 
                 all_tasks_out.append(
-                    await build_task_details(
+                    partial(
+                        build_task_details,
                         task,
                         alloc=alloc,
                         submission=submission,
@@ -654,7 +665,8 @@ async def list_project_tasks_general(
                     )
 
                     all_tasks_out.append(
-                        await build_task_details(
+                        partial(
+                            build_task_details,
                             is_reviewer=True,
                             task=task,
                             rev_alloc=rev_alloc,
@@ -677,9 +689,9 @@ async def list_project_tasks_general(
                 if not has_review_alloc:
                     continue  # skip unassigned ones
 
-    # Pagination
+    # Pagination: only the requested page is turned into response models
     total_count = len(all_tasks_out)
-    paginated_tasks = all_tasks_out[offset: offset + limit]
+    paginated_tasks = [await build() for build in all_tasks_out[offset: offset + limit]]
 
     return {
         "project_id": project.id,
@@ -102,6 +102,7 @@ async def assign_submission_to_reviewer(
     allocation = ReviewerAllocation(
         submission_id=submission_id,
         reviewer_id=reviewer_id,
+        project_id=project_id,
         status=Status.pending,
         assigned_at=datetime.utcnow()
     )
@@ -212,6 +213,7 @@ async def upload_reviewer_allocations(
         allocation = ReviewerAllocation(
             submission_id=submission.id,
             reviewer_id=reviewer.id,
+            project_id=project_id,
             status=Status.pending,
             assigned_at=assigned_at
         )
@@ -387,18 +389,19 @@ async def review_submission(
         review_allocation.reviewed_at = datetime.utcnow()
         session.add(review_allocation)
 
-    # 8️⃣ Commit all changes
-    await session.commit()
-    await session.refresh(submission)
-
-
     # ------------------------------
-    # 9️⃣ Award coins (one-time per submission)
+    # 8️⃣ Queue coin awards (paid once per submission by the outbox worker)
     # ------------------------------
     if submission.status == Status.accepted:
         await award_coins_on_accept(session, submission)
 
-    await award_reviewer_payment(session, reviewer_id, submission.id)
+    # Only accepted reviewer allocations are paid: don't queue events that can never be
+    if review_allocation and review_allocation.status == Status.accepted:
+        await award_reviewer_payment(session, reviewer_id, submission.id)
+
+    # 9️⃣ Commit the review, status updates and queued awards together
+    await session.commit()
+    await session.refresh(submission)
 
 
     return {
@@ -505,7 +508,8 @@ async def reviewer_review_submission(
 
     if status == Status.accepted:
         await award_coins_on_accept(session, submission)
-        await award_reviewer_payment(session, reviewer_id, submission.id)
+        if review_alloc:
+            await award_reviewer_payment(session, reviewer_id, submission.id)
 
     session.add(submission)
     await session.commit()
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from functools import partial
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, BackgroundTasks, Response
 from typing import Dict, Optional, List, Any
 from fastapi import Form
-from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from src.utils.reviwer_auto_assignment import auto_assign_reviewer
+from sqlalchemy.orm import selectinload, joinedload, raiseload
+from src.utils.reviwer_auto_assignment import auto_assign_reviewer_in_background
 from sqlmodel import select
+from sqlalchemy import func, case, tuple_
 
 
 from src.db.models import (
@@ -14,12 +15,14 @@ from src.db.models import (
     TaskType,
     Status,
     Task,
+    Prompt,
     User,
 )
 from src.db.database import get_session
-from src.utils.s3 import upload_file_to_s3
+from src.utils.s3 import upload_stream_to_s3
 from src.utils.text_helpers import get_effective_payload_text
 from src.schemas.submission_schemas import SubmissionResponse, PromptInfo
+from src.utils.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
 from src.utils.file_to_s3 import fetch_and_upload_from_telegram
 
 
@@ -36,6 +39,15 @@ ALLOWED_STATUSES = [
 # ---------------------------
 # FILE UPLOAD
 # ---------------------------
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def iter_upload_file(file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE):
+    """Yield an UploadFile's content chunk by chunk instead of reading it whole."""
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
 async def handle_file_upload(file: UploadFile, folder: str, allowed_types: Optional[list[str]] = None) -> str:
     """
     Uploads a file to S3.
@@ -51,9 +63,8 @@ async def handle_file_upload(file: UploadFile, folder: str, allowed_types: Optio
     if allowed_types and file.content_type not in allowed_types:
         raise HTTPException(status_code=400, detail=f"File type {file.content_type} not allowed")
 
-    content = await file.read()
     file_name = f"{folder}/{file.filename}"
-    s3_path = await upload_file_to_s3(content, file_name, file.content_type)
+    s3_path = await upload_stream_to_s3(iter_upload_file(file), file_name, file.content_type)
     if not s3_path:
         raise HTTPException(status_code=500, detail=f"Failed to upload {folder} to S3")
     return s3_path
@@ -66,6 +77,7 @@ async def handle_file_upload(file: UploadFile, folder: str, allowed_types: Optio
 @router.post("/projects/{project_id}/agent", response_model=SubmissionResponse)
 async def create_submission(
     project_id: str,
+    background_tasks: BackgroundTasks,
     task_id: str = Form(...),
     assignment_id: str = Form(...),
     user_id: Optional[str] = Form(None),
@@ -114,8 +126,32 @@ async def create_submission(
     - 403 Forbidden   → User does not match allocation.
     - 404 Not Found   → Allocation not found for this project.
     """
-    # --- Validate allocation --- also get the task prompt
-    result = await session.execute(
+    # --- Validate the content up front; nothing is written to S3 until the
+    # allocation, ownership and duplicate checks below have passed ---
+    upload = None
+    if type == TaskType.text:
+        if not payload_text:
+            raise HTTPException(status_code=400, detail="Text submission requires payload_text")
+    elif type == TaskType.audio:
+        if telegram_file_id:
+            upload = partial(fetch_and_upload_from_telegram, telegram_file_id, "audio")
+        elif file:
+            upload = partial(handle_file_upload, file, "audio", ["audio/mpeg", "audio/ogg", "audio/wav"])
+        else:
+            raise HTTPException(status_code=400, detail="Audio submission requires file or telegram_file_id")
+    elif type == TaskType.image:
+        if not file:
+            raise HTTPException(status_code=400, detail="Image submission requires file")
+        upload = partial(handle_file_upload, file, "image", ["image/png", "image/jpeg"])
+    elif type == TaskType.video:
+        if not file:
+            raise HTTPException(status_code=400, detail="Video submission requires file")
+        upload = partial(handle_file_upload, file, "video", ["video/mp4"])
+    else:
+        raise HTTPException(status_code=400, detail="Task type must be specified")
+
+    # --- Validate allocation ---
+    alloc_query = (
         select(AgentAllocation)
         .where(
             AgentAllocation.id == assignment_id,
@@ -126,6 +162,8 @@ async def create_submission(
             selectinload(AgentAllocation.project)
         )
     )
+    result = await session.execute(alloc_query)
+
     db_task_alloc = result.scalars().first()
     print(f"db_task_alloc: {db_task_alloc}\n\n\n\n")
     if not db_task_alloc:
@@ -142,29 +180,8 @@ async def create_submission(
     if existing_submission and existing_submission.status != Status.redo:
         raise HTTPException(status_code=400, detail="Submission already exists for this task")
 
-
-    # --- Handle file uploads ---
-    file_url = None
-    if type == TaskType.text:
-        if not payload_text:
-            raise HTTPException(status_code=400, detail="Text submission requires payload_text")
-    elif type == TaskType.audio:
-        if telegram_file_id:
-            file_url = await fetch_and_upload_from_telegram(telegram_file_id, "audio")
-        elif file:
-            file_url = await handle_file_upload(file, "audio", ["audio/mpeg", "audio/ogg", "audio/wav"])
-        else:
-            raise HTTPException(status_code=400, detail="Audio submission requires file or telegram_file_id")
-    elif type == TaskType.image:
-        if not file:
-            raise HTTPException(status_code=400, detail="Image submission requires file")
-        file_url = await handle_file_upload(file, "image", ["image/png", "image/jpeg"])
-    elif type == TaskType.video:
-        if not file:
-            raise HTTPException(status_code=400, detail="Video submission requires file")
-        file_url = await handle_file_upload(file, "video", ["video/mp4"])
-    else:
-        raise HTTPException(status_code=400, detail="Task type must be specified")
+    # --- Upload only once the caller is known to own this allocation ---
+    file_url = await upload() if upload else None
 
 
     # --- Create submission ---
@@ -182,7 +199,9 @@ async def create_submission(
     # Update allocation
     db_task_alloc.submission = submission
     db_task_alloc.status = Status.submitted
-    db_task_alloc.submitted_at = datetime.utcnow()
+    # DB clock, set within the same transaction; timezone('utc', ...) keeps the
+    # naive-UTC convention used by the other timestamp columns
+    db_task_alloc.submitted_at = func.timezone("utc", func.now())
     session.add(db_task_alloc)
     
     # --- Track Project-level redo count ---
@@ -200,13 +219,13 @@ async def create_submission(
     
 
     if bool(db_task_alloc.project.is_auto_review):
+        # The client doesn't wait on reviewer assignment: do it after the response is sent
         print("🔍 Auto-assigning submission to reviewer...")
-        result_auto_assign = await auto_assign_reviewer(
+        background_tasks.add_task(
+            auto_assign_reviewer_in_background,
             project_id=project_id,
-            submission=submission,
-            session=session
+            submission_id=submission.id,
         )
-        print(f"🔍 Auto-assign result: {result_auto_assign}")
 
     return SubmissionResponse(
         submission_id=submission.id,
@@ -229,10 +248,13 @@ async def create_submission(
 # ---------------------------
 @router.get("/all/agent", response_model=List[SubmissionResponse])
 async def list_submissions(
+    response: Response,
     project_id: Optional[str] = None,
     user_id: Optional[str] = None,
     user_email: Optional[str] = None,
     status: Optional[List[Status]] = Query([Status.submitted], description="Filter by status(es)"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size (all rows when omitted)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous page"),
     session: AsyncSession = Depends(get_session),
 ):
     """
@@ -242,6 +264,9 @@ async def list_submissions(
     - user_email (all submissions by a contributor via email)
     - status (submitted, approved, rejected, etc.)
 
+    Results are newest first. With `limit`, pass the returned `X-Next-Cursor`
+    header as `cursor` to fetch the next page; it is absent on the last page.
+
     Returns:
         List[SubmissionResponse]: Submission records with contributor and project info.
     """
@@ -254,72 +279,94 @@ async def list_submissions(
                 detail=f"Status must be one of: {[s.value for s in ALLOWED_STATUSES]}",
             )
 
-    # Build query with eager loading
+    # Flat Core query: read only the columns the response needs, with no ORM
+    # objects or relationship wiring per row.
     query = (
-        select(Submission)
-        .options(
-            selectinload(Submission.allocation).selectinload(AgentAllocation.project),
-            selectinload(Submission.task).selectinload(Task.prompt),
-            selectinload(Submission.user),
+        select(
+            Submission.id,
+            Submission.task_id,
+            Submission.assignment_id,
+            User.id.label("user_id"),
+            User.email.label("user_email"),
+            Submission.type,
+            # same rule as get_effective_payload_text: the submission's text if it
+            # has any non-blank content, otherwise the prompt's
+            case(
+                (Submission.payload_text.regexp_match(r"\S"), Submission.payload_text),
+                else_=func.nullif(Prompt.text, ""),
+            ).label("payload_text"),
+            Submission.file_url,
+            Submission.status,
+            Submission.created_at,
+            Submission.updated_at,
+            func.coalesce(AgentAllocation.project_id, Task.project_id).label("project_id"),
+            Prompt.id.label("prompt_id"),
+            Prompt.text.label("prompt_text"),
+            Prompt.media_url,
+            Prompt.category,
+            Prompt.domain,
         )
+        .select_from(Submission)
+        .outerjoin(AgentAllocation, Submission.assignment_id == AgentAllocation.id)
+        .outerjoin(Task, Submission.task_id == Task.id)
+        .outerjoin(Prompt, Task.prompt_id == Prompt.id)
+        .outerjoin(User, Submission.user_id == User.id)
     )
 
     # Filter by project
     if project_id:
-        query = query.join(Submission.allocation).where(AgentAllocation.project_id == project_id)
+        query = query.where(AgentAllocation.project_id == project_id)
 
     # Filter by contributor (ID or email)
     if user_id:
         query = query.where(Submission.user_id == user_id)
     elif user_email:
-        query = query.join(Submission.user).where(User.email == user_email)
+        query = query.where(User.email == user_email)
 
     if status:
         query = query.where(Submission.status.in_(status))
 
-    # Execute
-    result = await session.execute(query)
-    submissions = result.scalars().unique().all()  # unique() prevents duplicates from joins
+    # Keyset pagination on (created_at, id): each page costs the same however deep it is
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.where(tuple_(Submission.created_at, Submission.id) < (cursor_created_at, cursor_id))
+    query = query.order_by(Submission.created_at.desc(), Submission.id.desc()).limit(limit)
 
-    # Construct response list
+    # Construct response list (model_construct: the rows come straight from typed
+    # columns, so per-row validation would only repeat work)
     submission_list = []
-    for s in submissions:
-        prompt_obj = s.task.prompt if s.task and s.task.prompt else None
-        payload_text = get_effective_payload_text(s, s.task.prompt)
-        if isinstance(payload_text, tuple) and len(payload_text) == 1:
-            payload_text = payload_text[0]
-
-        project_id_resp = (
-            s.allocation.project_id if s.allocation else s.task.project_id if s.task else None
-        )
-
+    async for row in await session.stream(query):
         submission_list.append(
-            SubmissionResponse(
-                submission_id=s.id,
-                project_id=project_id_resp,
-                task_id=s.task_id,
-                assignment_id=s.assignment_id,
-                user_id=s.user.id if s.user else None,
-                user_email=s.user.email if s.user else None,
-                type=s.type,
-                payload_text=payload_text,
-                file_url=s.file_url,
-                status=s.status,
-                created_at=s.created_at,
-                updated_at=s.updated_at,
-                prompt=PromptInfo(
-                    prompt_id=prompt_obj.id if prompt_obj else None,
-                    sentence_id=prompt_obj.id if prompt_obj else None,
-                    sentence_text=prompt_obj.text if prompt_obj else None,
-                    media_url=prompt_obj.media_url if prompt_obj else None,
-                    category=prompt_obj.category if prompt_obj else None,
-                    domain=prompt_obj.domain if prompt_obj else None,
+            SubmissionResponse.model_construct(
+                submission_id=row.id,
+                project_id=row.project_id,
+                task_id=row.task_id,
+                assignment_id=row.assignment_id,
+                user_id=row.user_id,
+                user_email=row.user_email,
+                type=row.type,
+                payload_text=row.payload_text,
+                file_url=row.file_url,
+                status=row.status,
+                created_at=row.created_at,
+                updated_at=row.updated_at,
+                prompt=PromptInfo.model_construct(
+                    prompt_id=row.prompt_id,
+                    sentence_id=row.prompt_id,
+                    sentence_text=row.prompt_text,
+                    media_url=row.media_url,
+                    category=row.category,
+                    domain=row.domain,
                 )
-                if prompt_obj
+                if row.prompt_id
                 else None,
             )
         )
 
+    if limit and len(submission_list) == limit:
+        last = submission_list[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.submission_id)
+
     return submission_list
 
 
@@ -353,13 +400,15 @@ async def get_submission(
         select(Submission)
         .where(Submission.id == submission_id)
         .options(
-            selectinload(Submission.task)
-            .selectinload(Task.prompt),        # load prompt under task
-            selectinload(Submission.allocation),
-            selectinload(Submission.user)
+            # single row, many-to-one only: one JOINed query instead of 1 + 3 IN-queries
+            joinedload(Submission.task)
+            .joinedload(Task.prompt),        # load prompt under task
+            joinedload(Submission.allocation),
+            joinedload(Submission.user)
         )
+        .options(raiseload("*"))
     )
-    submission = result.scalars().first()
+    submission = result.unique().scalars().first()
     if not submission:
         raise HTTPException(status_code=404, detail="Submission not found")
 
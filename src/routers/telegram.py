@@ -1,11 +1,14 @@
+import asyncio
 from email import message
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import select
 from src.db.models import User, CoinPayment, Role, AgentAllocation, Submission, Review, Status
-from src.db.database import get_session
+from src.db.database import get_session, run_out_of_band
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.utils.auth import get_password_hash, verify_password
+from src.utils.auth import get_password_hash_async, verify_password_async
+from src.utils.user_utils import get_cached_user_by_email, invalidate_cached_user
+from src.services.coins import from_micro_coins
 from src.schemas.user_schemas import UserRegisterRequest, UserResponse, UserStatusResponse
 from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
@@ -14,6 +17,30 @@ from sqlalchemy.exc import SQLAlchemyError
 router = APIRouter()
 
 
+# ---------------------------
+# USER LOOKUP DEPENDENCIES
+# ---------------------------
+async def user_by_email(email: str, session: AsyncSession = Depends(get_session)) -> User:
+    """Dependency: the User row for `email` (404 if there is none)."""
+    try:
+        user_result = await session.execute(select(User).where(User.email == email))
+        user = user_result.scalars().first()
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found. Please register.")
+    return user
+
+
+async def cached_user_by_email(email: str, session: AsyncSession = Depends(get_session)) -> UserResponse:
+    """Dependency: read-only snapshot of the user for `email`, served from the user cache."""
+    user = await get_cached_user_by_email(session, email)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found. Please register.")
+    return user
+
+
 @router.post("/register", response_model=UserResponse)
 async def register_telegram_user(payload: UserRegisterRequest, session: AsyncSession = Depends(get_session)):
     """Register or link a Telegram account to an existing user based on email."""
@@ -35,6 +62,7 @@ async def register_telegram_user(payload: UserRegisterRequest, session: AsyncSes
         session.add(user)
         await session.commit()
         await session.refresh(user)
+        invalidate_cached_user(user.email)
         return user
         
 
@@ -51,10 +79,11 @@ async def register_telegram_user(payload: UserRegisterRequest, session: AsyncSes
     print(f"Before commit: {user}")
 
     if user.password:  # only hash if provided
-        user.password = get_password_hash(user.password)
+        user.password = await get_password_hash_async(user.password)
     session.add(user)
     await session.commit()
     await session.refresh(user)
+    invalidate_cached_user(user.email)
 
     print(f"After commit: {user}")
     return user    
@@ -62,24 +91,14 @@ async def register_telegram_user(payload: UserRegisterRequest, session: AsyncSes
 
 @router.get("/login", response_model=UserResponse)
 async def login_telegram_user(
-    email: str, 
     password: Optional[str] = None, 
-    session: AsyncSession = Depends(get_session)
+    user: User = Depends(user_by_email),
 ):
     """Login a user with email (telegram_id is optional)."""
-    try:
-        user_result = await session.execute(select(User).where(User.email == email))
-        user = user_result.scalars().first()
-    except SQLAlchemyError as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found. Please register.")
-
     if password:
         if not user.password:  # user was created without a password
             raise HTTPException(status_code=400, detail="This account does not have a password set.")
-        if not verify_password(password, user.password):
+        if not await verify_password_async(password, user.password):
             raise HTTPException(status_code=401, detail="Incorrect password.")
 
     return {
@@ -97,29 +116,52 @@ async def login_telegram_user(
 
 # /me endpoint using email (telegram optional)
 @router.get("/me", response_model=UserResponse)
-async def get_telegram_user(email: str, session: AsyncSession = Depends(get_session)):
+async def get_telegram_user(user: UserResponse = Depends(cached_user_by_email)):
     """Fetch user's info by email (telegram optional)."""
-    user_result = await session.execute(select(User).where(User.email == email))
-    user = user_result.scalars().first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found. Please register.")
     return user
 
 
 
 @router.get("/status/{email}", response_model=UserStatusResponse)
-async def get_telegram_status(email: str, session: AsyncSession = Depends(get_session)):
+async def get_telegram_status(
+    user: UserResponse = Depends(cached_user_by_email),
+    session: AsyncSession = Depends(get_session),
+):
     """Fetch user's status by email (telegram optional)."""
-    user_result = await session.execute(select(User).where(User.email == email))
-    user = user_result.scalars().first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found. Please register.")
+
+    coins_query = select(CoinPayment.coins_earned).where(CoinPayment.user_id == user.id)
+
+    # The remaining reads only depend on user.id, so they go out concurrently,
+    # each on its own pooled connection, instead of one round trip after another.
+    if user.role == Role.agent:
+        coins_earned_result, task_counts_result, sentences_read_result = await asyncio.gather(
+            run_out_of_band(coins_query),
+            # Count completed/pending in the DB rather than loading every allocation row
+            run_out_of_band(
+                select(
+                    func.count().filter(AgentAllocation.completed_at.isnot(None)),
+                    func.count().filter(AgentAllocation.completed_at.is_(None)),
+                ).where(AgentAllocation.user_id == user.id)
+            ),
+            # ✅ Count submissions directly in DB
+            run_out_of_band(select(func.count()).select_from(Submission).where(Submission.user_id == user.id)),
+        )
+    elif user.role == Role.reviewer:
+        coins_earned_result, tasks_assigned_to_review_result, completed_reviews_result = await asyncio.gather(
+            run_out_of_band(coins_query),
+            run_out_of_band(select(func.count()).select_from(Review).where(Review.reviewer_id == user.id)),
+            run_out_of_band(
+                select(func.count()).select_from(Review).where(
+                    Review.reviewer_id == user.id,
+                    Review.decision == Status.approved
+                )
+            ),
+        )
+    else:
+        coins_earned_result = await session.execute(coins_query)
 
     # Base info
-    coins_earned_result = await session.execute(
-        select(CoinPayment.coins_earned).where(CoinPayment.user_id == user.id)
-    )
-    coins_earned = coins_earned_result.scalars().first() or 0
+    coins_earned = from_micro_coins(coins_earned_result.scalars().first())
 
     base_status = {
         "role": user.role,
@@ -129,39 +171,19 @@ async def get_telegram_status(email: str, session: AsyncSession = Depends(get_se
     }
 
     if user.role == Role.agent:
-        assigned_tasks_result = await session.execute(
-            select(AgentAllocation).where(AgentAllocation.user_id == user.id)
-        )
-        assigned_tasks = assigned_tasks_result.scalars().all()
-
-        completed_tasks = [t for t in assigned_tasks if t.completed_at]
-        pending_tasks = [t for t in assigned_tasks if not t.completed_at]
+        completed_tasks, pending_tasks = task_counts_result.one()
 
-        # ✅ Count submissions directly in DB
-        sentences_read_result = await session.execute(
-            select(func.count()).select_from(Submission).where(Submission.user_id == user.id)
-        )
         sentences_read = sentences_read_result.scalar_one()
 
         base_status.update({
-            "total_tasks_assigned": len(assigned_tasks),
-            "completed_tasks": len(completed_tasks),
-            "pending_tasks": len(pending_tasks),
+            "total_tasks_assigned": completed_tasks + pending_tasks,
+            "completed_tasks": completed_tasks,
+            "pending_tasks": pending_tasks,
             "sentences_read": sentences_read,
         })
 
     elif user.role == Role.reviewer:
-        tasks_assigned_to_review_result = await session.execute(
-            select(func.count()).select_from(Review).where(Review.reviewer_id == user.id)
-        )
         tasks_assigned_to_review = tasks_assigned_to_review_result.scalar_one()
-
-        completed_reviews_result = await session.execute(
-            select(func.count()).select_from(Review).where(
-                Review.reviewer_id == user.id,
-                Review.decision == Status.approved
-            )
-        )
         completed_reviews = completed_reviews_result.scalar_one()
 
         base_status.update({
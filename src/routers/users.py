@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Body
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Body, Query, Response
 from sqlmodel import Session, select
 from typing import List, Optional
 import pandas as pd
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import tuple_, update, func, cast, case
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
 from src.db.models import User
 from src.db.database import get_session
-from src.utils.user_utils import create_user_in_db, process_excel_users
+from src.schemas.user_schemas import UserListItem
+from src.utils.pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from src.utils.user_utils import create_user_in_db, process_excel_users, invalidate_cached_user
 
 router = APIRouter()
 
@@ -62,12 +66,33 @@ async def upload_users_excel(file: UploadFile = File(...), session: AsyncSession
 # 📜 USER LIST & DETAIL
 # ============================================================
 
-@router.get("/all/users", response_model=List[User])
-async def read_users(offset: int = 0, limit: int = 100, session: AsyncSession = Depends(get_session)):
-    """📃 Get a paginated list of all users."""
-    result = await session.execute(select(User).offset(offset).limit(limit))
-    users = result.scalars().all()
-    return users
+@router.get("/all/users", response_model=List[UserListItem])
+async def read_users(
+    response: Response,
+    offset: int = Query(0, ge=0, description="Rows to skip (ignored when cursor is given)"),
+    limit: int = Query(100, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous page"),
+    session: AsyncSession = Depends(get_session),
+):
+    """📃 Get a paginated list of all users (newest first).
+
+    Pages by `offset`, or, cheaper for deep pages, by passing the `X-Next-Cursor`
+    response header back as `cursor`.
+    """
+    # Only the list columns: served from ix_user_list_cover without touching the table
+    query = select(User.id, User.name, User.email, User.role, User.created_at)
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.where(tuple_(User.created_at, User.id) < (cursor_created_at, cursor_id))
+    elif offset:
+        query = query.offset(offset)
+    query = query.order_by(User.created_at.desc(), User.id.desc()).limit(limit)
+
+    result = await session.execute(query)
+    rows = result.all()
+    if len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return [UserListItem(id=r.id, name=r.name, email=r.email, role=r.role) for r in rows]
 
 
 @router.get("/{user_id}/details", response_model=User)
@@ -93,23 +118,70 @@ async def update_user(user_id: str, user: User, session: AsyncSession = Depends(
     db_user = await session.get(User, user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
+    old_email = db_user.email
     user_data = user.model_dump(exclude_unset=True)
     db_user.sqlmodel_update(user_data)
     session.add(db_user)
     await session.commit()
     await session.refresh(db_user)
+    invalidate_cached_user(old_email, db_user.email)
     return db_user
 
 
 # ============================================================
 # 🔄 LANGUAGE MANAGEMENT
 # ============================================================
+def _append_unique(column, values: List[str]):
+    """
+    SQL expression for a JSONB list column with `values` appended,
+    dropping duplicates and keeping first-seen order (runs inside the UPDATE,
+    so concurrent appends can't overwrite each other).
+    """
+    # SQL NULL and JSON null (stored when a user registers without the list) count as empty
+    current = case((func.jsonb_typeof(column) == "array", column), else_=cast([], JSONB))
+    elements = func.jsonb_array_elements(
+        current.op("||")(cast(values, JSONB))
+    ).table_valued("value", with_ordinality="ord").render_derived()
+    deduped = (
+        select(elements.c.value, func.min(elements.c.ord).label("ord"))
+        .group_by(elements.c.value)
+        .subquery()
+    )
+    return select(
+        func.coalesce(func.jsonb_agg(aggregate_order_by(deduped.c.value, deduped.c.ord)), cast([], JSONB))
+    ).scalar_subquery()
+
+
+async def _update_user_list(session: AsyncSession, user_id: str, column, new_values, add_values) -> User:
+    """Replace or append to a user's JSONB list column in a single UPDATE ... RETURNING."""
+    if new_values is not None:
+        # Replace the list (dict.fromkeys: drop duplicates, keep order)
+        value = list(dict.fromkeys(new_values))
+    elif add_values is not None:
+        # Append unique values
+        value = _append_unique(column, add_values)
+    else:
+        user = await session.get(User, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return user
+
+    user = await session.scalar(
+        update(User).where(User.id == user_id).values({column: value}).returning(User)
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    await session.commit()
+    invalidate_cached_user(user.email)
+    return user
+
+
 @router.patch("/{user_id}/languages", response_model=User)
-def update_user_languages(
+async def update_user_languages(
     user_id: str,
     new_languages: Optional[List[str]] = Body(None),
     add_languages: Optional[List[str]] = Body(None),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     🌐 Update or append a user's language list.
@@ -124,33 +196,16 @@ def update_user_languages(
     }
     ```
     """
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    current_langs = user.languages or []
-
-    if new_languages is not None:
-        # Replace the list
-        user.languages = list(set(new_languages))
-    elif add_languages is not None:
-        # Append unique values
-        updated = list(set(current_langs + add_languages))
-        user.languages = updated
-
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-    return user
+    return await _update_user_list(session, user_id, User.languages, new_languages, add_languages)
 
 
 # 🗣️ DIALECT MANAGEMEN
 @router.patch("/{user_id}/dialects", response_model=User)
-def update_user_dialects(
+async def update_user_dialects(
     user_id: str,
     new_dialects: Optional[List[str]] = Body(None),
     add_dialects: Optional[List[str]] = Body(None),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     🗣️ Update or append a user's dialect list.
@@ -158,22 +213,7 @@ def update_user_dialects(
     - **new_dialects:** Replaces the entire list.
     - **add_dialects:** Appends to the current list (ignores duplicates).
     """
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    current_dialects = user.dialects or []
-
-    if new_dialects is not None:
-        user.dialects = list(set(new_dialects))
-    elif add_dialects is not None:
-        updated = list(set(current_dialects + add_dialects))
-        user.dialects = updated
-
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-    return user
+    return await _update_user_list(session, user_id, User.dialects, new_dialects, add_dialects)
 
 
 
@@ -3,7 +3,7 @@ from operator import is_
 from pydantic import BaseModel
 from typing import List, Optional
 from typing import List, Optional
-from pydantic import BaseModel, Field, conint, confloat
+from pydantic import BaseModel, Field, conint, confloat, ConfigDict
 from typing import Dict
 
 from src.db.models import TaskType
@@ -46,15 +46,13 @@ class ProjectCreate(BaseModel):
     total_tasks: Optional[int] = Field(0, ge=0, description="Total number of tasks allocated in the project.")
     total_submissions: Optional[int] = Field(0, ge=0, description="Total number of submissions received for the project.")
     
-    class Config:
-        from_attributes = True  # Enables compatibility with SQLAlchemy models
+    model_config = ConfigDict(from_attributes=True)  # Enables compatibility with SQLAlchemy models
 
 
 class ReviewScores(BaseModel):
     comments: Optional[str] = None
 
-    class Config:
-        extra='allow' 
+    model_config = ConfigDict(extra='allow')
         
 
 class ProjectUpdate(BaseModel):
@@ -104,9 +102,7 @@ class AllocationOut(BaseModel):
     status: str
     assigned_at: datetime
 
-    class Config:
-        from_attributes = True
-        populate_by_name = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 class AllocationResponse(BaseModel):
     allocated_count: int
@@ -1,7 +1,7 @@
 from re import sub
 from typing import Optional
 from uuid import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from src.db.models import Status  # import your Enum
 
@@ -9,8 +9,7 @@ class ProjectResponse(BaseModel):
     id: str
     name: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProjectAllocationResponse(BaseModel):
@@ -20,8 +19,7 @@ class ProjectAllocationResponse(BaseModel):
     status: Status
     project: Optional[ProjectResponse] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 
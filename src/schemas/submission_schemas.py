@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 from src.db.models import Status, TaskType
@@ -18,8 +18,7 @@ class SubmissionOut(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 from typing import Optional, Dict
@@ -52,8 +51,6 @@ class SubmissionResponse(BaseModel):
     prompt: Optional[PromptInfo] = None
 
 
-    class Config:
-        from_attributes = True
-        fields = {"submission_id": "id"}
+    model_config = ConfigDict(from_attributes=True)
 
 
@@ -1,7 +1,7 @@
 from email import message
 from typing import List, Optional
 from pandas.core.computation.ops import Op
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, ConfigDict
 from enum import Enum
 
 
@@ -22,6 +22,14 @@ class UserRegisterRequest(BaseModel):
     dialects: Optional[List[str]] = None
 
 
+# Lightweight row for the admin user list
+class UserListItem(BaseModel):
+    id: str
+    name: Optional[str] = None
+    email: Optional[str] = None
+    role: RoleEnum
+
+
 # Response schema for user basic info
 class UserResponse(BaseModel):
     message: Optional[str] = None
@@ -33,8 +41,7 @@ class UserResponse(BaseModel):
     languages: Optional[List[str]] = None
     dialects: Optional[List[str]] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 
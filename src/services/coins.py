@@ -1,129 +1,247 @@
 from datetime import datetime
+from typing import List, Sequence
 from sqlmodel import  select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import BigInteger, and_, cast, func, literal, true
+from sqlalchemy.dialects.postgresql import insert
 
 from fastapi import HTTPException
-from src.db.models import Project, AgentAllocation, CoinPayment, Status, Submission, ReviewerAllocation, Task
+from src.db.models import Project, AgentAllocation, CoinPayment, Status, Submission, ReviewerAllocation, Task, OutboxEvent
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.utils.cache import TTLCache
+
+
+# Outbox event types handled by src/services/outbox.py
+AWARD_AGENT_EVENT = "award_agent_coins"
+AWARD_REVIEWER_EVENT = "award_reviewer_coins"
+
+# Submission statuses that earn the agent their coins
+_ACCEPTED_STATUSES = frozenset({Status.accepted, Status.approved})
+
+# CoinPayment.coins_earned is stored in micro-coins so sums never drift
+COIN_SCALE = 1_000_000
+
+
+def to_micro_coins(coins: float) -> int:
+    """Project coin rate -> the integer amount stored on CoinPayment."""
+    return int(round((coins or 0) * COIN_SCALE))
+
+
+def from_micro_coins(micro_coins: int) -> float:
+    """Stored CoinPayment amount (or a sum of them) -> coins for display."""
+    return (micro_coins or 0) / COIN_SCALE
+
+
+def agent_payment_key(user_id: str, agent_allocation_id: str) -> str:
+    """Idempotency key of the one agent payment allowed per allocation."""
+    return f"agent:{user_id}:{agent_allocation_id}"
+
+
+# project_id -> (agent_coin, reviewer_coin); rates rarely change and update_project invalidates
+project_coins_cache = TTLCache(ttl=300)
+
+
+async def get_project_coins(session: AsyncSession, project_id: str) -> tuple[float, float]:
+    """Return (agent_coin, reviewer_coin) for a project, from cache when fresh."""
+    coins = project_coins_cache.get(project_id)
+    if coins is None:
+        row = (await session.execute(
+            select(Project.agent_coin, Project.reviewer_coin).where(Project.id == project_id)
+        )).first()
+        if not row:
+            return 0.0, 0.0
+        coins = (row.agent_coin, row.reviewer_coin)
+        project_coins_cache.set(project_id, coins)
+    return coins
+
+
+def invalidate_project_coins(project_id: str) -> None:
+    """Drop the cached coin rates after the project row changes."""
+    project_coins_cache.delete(project_id)
 
 
 # -------------------------------------------------------------------
-# 🪙 AWARD AGENT COINS
+# 📨 QUEUE AWARDS (request path)
 # -------------------------------------------------------------------
 async def award_coins_on_accept(session: AsyncSession, submission: Submission):
+    """
+    Queue the agent's coin award for this submission.
+    The event is committed with the caller's transaction and paid by the outbox worker.
+    """
+    session.add(OutboxEvent(event_type=AWARD_AGENT_EVENT, payload={"submission_id": submission.id}))
+
+
+async def award_reviewer_payment(session: AsyncSession, reviewer_id: str, submission_id: str):
+    """
+    Queue the reviewer's coin award for this submission.
+    The event is committed with the caller's transaction and paid by the outbox worker.
+    """
+    session.add(OutboxEvent(
+        event_type=AWARD_REVIEWER_EVENT,
+        payload={"reviewer_id": reviewer_id, "submission_id": submission_id},
+    ))
+
+
+# -------------------------------------------------------------------
+# 🪙 PAY AGENT COINS (outbox worker)
+# -------------------------------------------------------------------
+async def pay_agent_coins(session: AsyncSession, submission: Submission):
     """
     Award coins to the agent once per submission if accepted.
     Redos do NOT trigger additional payments.
+    The payment is written in the caller's transaction; the caller commits.
     """
-    alloc_result = await session.execute(
+    # Not accepted: nothing to pay, and no need to touch the database
+    if submission.status not in _ACCEPTED_STATUSES:
+        return None
+
+    alloc = await session.scalar(
         select(AgentAllocation).where(AgentAllocation.id == submission.assignment_id)
     )
-    alloc = alloc_result.scalars().first()
     if not alloc:
         raise HTTPException(status_code=404, detail="Project allocation not found")
 
-    # Skip if already paid
-    existing_result = await session.execute(
-        select(CoinPayment).where(
-            CoinPayment.user_id == submission.user_id,
-            CoinPayment.agent_allocation_id == alloc.id
+    coin_amt, _ = await get_project_coins(session, alloc.project_id)
+
+    # Insert unless already paid: the unique idempotency_key makes this a single
+    # race-free statement; returns None when a payment already exists
+    payment = await session.scalar(
+        insert(CoinPayment)
+        .values(
+            user_id=submission.user_id,
+            project_id=alloc.project_id,
+            agent_allocation_id=alloc.id,
+            task_id=submission.task_id,
+            coins_earned=to_micro_coins(coin_amt),
+            approved=True,
+            idempotency_key=agent_payment_key(submission.user_id, alloc.id),
         )
+        .on_conflict_do_nothing(index_elements=["idempotency_key"])
+        .returning(CoinPayment)
     )
-    if existing_result.scalars().first():
-        return None
+    return payment
 
-    if submission.status not in (Status.accepted, Status.approved):
-        return None
 
-    project_result = await session.execute(
-        select(Project).where(Project.id == alloc.project_id)
-    )
-    project = project_result.scalars().first()
-    coin_amt = project.agent_coin if project else 0.0
-
-    payment = CoinPayment(
-        user_id=submission.user_id,
-        project_id=alloc.project_id,
-        agent_allocation_id=alloc.id,
-        task_id=submission.task_id,
-        coins_earned=coin_amt,
-        approved=True,
-    )
-    session.add(payment)
-    await session.commit()
-    await session.refresh(payment)
-    return payment
+async def pay_agent_coins_batch(session: AsyncSession, submissions: Sequence[Submission]) -> List[CoinPayment]:
+    """
+    Batch version of pay_agent_coins: one SELECT for every allocation and coin rate,
+    then one multi-row INSERT ... ON CONFLICT DO NOTHING for the accepted submissions.
+    Returns the payments created (already-paid allocations are skipped).
+    """
+    accepted = [s for s in submissions if s.status in _ACCEPTED_STATUSES]
+    if not accepted:
+        return []
+
+    allocs = {
+        row.id: row
+        for row in (await session.execute(
+            select(AgentAllocation.id, AgentAllocation.project_id, Project.agent_coin)
+            .outerjoin(Project, Project.id == AgentAllocation.project_id)
+            .where(AgentAllocation.id.in_({s.assignment_id for s in accepted}))
+        )).all()
+    }
+    if any(s.assignment_id not in allocs for s in accepted):
+        raise HTTPException(status_code=404, detail="Project allocation not found")
 
-    
+    rows = [
+        {
+            "user_id": s.user_id,
+            "project_id": allocs[s.assignment_id].project_id,
+            "agent_allocation_id": s.assignment_id,
+            "task_id": s.task_id,
+            "coins_earned": to_micro_coins(allocs[s.assignment_id].agent_coin),
+            "approved": True,
+            "idempotency_key": agent_payment_key(s.user_id, s.assignment_id),
+        }
+        for s in accepted
+    ]
+    result = await session.scalars(
+        insert(CoinPayment)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["idempotency_key"])
+        .returning(CoinPayment)
+    )
+    return list(result.all())
 
 
-async def award_reviewer_payment(session: AsyncSession, reviewer_id: str, submission_id: str):
+# -------------------------------------------------------------------
+# 🪙 PAY REVIEWER COINS (outbox worker)
+# -------------------------------------------------------------------
+async def pay_reviewer_coins(session: AsyncSession, reviewer_id: str, submission_id: str):
     """
     Award coins to a reviewer once per submission.
     Coins are only awarded if the reviewer allocation status is 'accepted'.
     If the reviewer has already been paid for this submission, do nothing.
+    The payment is written in the caller's transaction; the caller commits.
     """
-    # 1️⃣ Fetch the ReviewerAllocation first
-    reviewer_alloc_result = await session.execute(
-        select(ReviewerAllocation).where(
+    # 1️⃣ Insert straight from the accepted allocation and its project's coin rate:
+    # one statement on the common path (unique idempotency_key skips repeats)
+    payable = (
+        select(
+            # idempotency_key, "reviewer:<user_id>:<reviewer_allocation_id>" (see CoinPayment)
+            func.concat("reviewer:", reviewer_id, ":", ReviewerAllocation.id),
+            literal(reviewer_id),
+            Project.id,
+            ReviewerAllocation.id,
+            cast(func.round(func.coalesce(Project.reviewer_coin, 0.0) * COIN_SCALE), BigInteger),
+            true(),
+        )
+        .select_from(ReviewerAllocation)
+        .join(Submission, Submission.id == ReviewerAllocation.submission_id)
+        .join(Task, Task.id == Submission.task_id)
+        .join(Project, Project.id == Task.project_id)
+        .where(
             ReviewerAllocation.submission_id == submission_id,
-            ReviewerAllocation.reviewer_id == reviewer_id
+            ReviewerAllocation.reviewer_id == reviewer_id,
+            ReviewerAllocation.status == Status.accepted
+        )
+        .limit(1)
+    )
+    payment = await session.scalar(
+        insert(CoinPayment)
+        .from_select(
+            ["idempotency_key", "user_id", "project_id", "reviewer_allocation_id", "coins_earned", "approved"],
+            payable,
         )
+        .on_conflict_do_nothing(index_elements=["idempotency_key"])
+        .returning(CoinPayment)
     )
-    reviewer_alloc = reviewer_alloc_result.scalars().first()
+    if payment is not None:
+        return payment
+
+    # 2️⃣ Nothing inserted: look up why (missing allocation, not accepted, already paid)
+    row = (await session.execute(
+        select(ReviewerAllocation, CoinPayment, Submission.id, Project.id)
+        .select_from(ReviewerAllocation)
+        .outerjoin(
+            CoinPayment,
+            and_(
+                CoinPayment.reviewer_allocation_id == ReviewerAllocation.id,
+                CoinPayment.user_id == reviewer_id
+            )
+        )
+        .outerjoin(Submission, Submission.id == ReviewerAllocation.submission_id)
+        .outerjoin(Task, Task.id == Submission.task_id)
+        .outerjoin(Project, Project.id == Task.project_id)
+        .where(
+            ReviewerAllocation.submission_id == submission_id,
+            ReviewerAllocation.reviewer_id == reviewer_id
+        )
+    )).first()
 
-    if not reviewer_alloc:
+    if not row:
         raise HTTPException(status_code=400, detail="Reviewer allocation not found")
+    reviewer_alloc, existing_payment, found_submission_id, project_id = row
 
-    # nly award if reviewer allocation is accepted
+    # Only award if reviewer allocation is accepted
     if reviewer_alloc.status != Status.accepted:
         return None
 
-    # 2️⃣ Check if reviewer already paid for this allocation
-    existing_result = await session.execute(
-        select(CoinPayment).where(
-            CoinPayment.user_id == reviewer_id,
-            CoinPayment.reviewer_allocation_id == reviewer_alloc.id
-        )
-    )
-    existing_payment = existing_result.scalars().first()
+    # Already paid for this allocation
     if existing_payment:
-        return existing_payment  # Already paid, do nothing
+        return existing_payment
 
-    # ✅ Preload submission with task + project
-    submission_result = await session.execute(
-        select(Submission)
-        .options(selectinload(Submission.task).selectinload(Task.project))
-        .where(Submission.id == submission_id)
-    )
-    submission = submission_result.scalars().first()
-    if not submission:
+    if not found_submission_id:
         raise HTTPException(status_code=404, detail="Submission not found")
-
-    project = submission.task.project if submission.task else None
-    if not project:
+    if not project_id:
         raise HTTPException(status_code=404, detail="Project not found")
-
-    # 4️⃣ Create payment
-    coin_amt = project.reviewer_coin or 0.0
-
-    payment = CoinPayment(
-        user_id=reviewer_id,
-        project_id=project.id,
-        reviewer_allocation_id=reviewer_alloc.id,
-        coins_earned=coin_amt,
-        approved=True,
-    )
-
-    session.add(payment)
-    await session.commit()
-    await session.refresh(payment)
-
-    return payment
-
-
-
-
-
-
-
+    return None
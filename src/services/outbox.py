@@ -0,0 +1,118 @@
+"""
+Outbox worker: carries out work queued as OutboxEvent rows.
+
+Events are added in the same transaction as the change that caused them
+(see src/services/coins.py), so they exist exactly when that change committed.
+The worker claims pending events with FOR UPDATE SKIP LOCKED, so every app
+process can run it side by side without handling an event twice.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import List
+
+from sqlmodel import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.database import async_session_maker
+from src.db.models import OutboxEvent, Submission
+from src.services.coins import (
+    AWARD_AGENT_EVENT,
+    AWARD_REVIEWER_EVENT,
+    pay_agent_coins,
+    pay_agent_coins_batch,
+    pay_reviewer_coins,
+)
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "2"))
+# Events that keep failing are left in the table (with last_error) after this many tries
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+
+
+async def _award_agent_coins(session: AsyncSession, payload: dict):
+    submission = await session.get(Submission, payload["submission_id"])
+    if not submission:
+        raise ValueError(f"Submission {payload['submission_id']} not found")
+    await pay_agent_coins(session, submission)
+
+
+async def _award_agent_coins_batch(session: AsyncSession, events: List[OutboxEvent]):
+    """Pay several agent award events with one allocation SELECT and one INSERT."""
+    ids = {event.payload["submission_id"] for event in events}
+    submissions = (await session.scalars(select(Submission).where(Submission.id.in_(ids)))).all()
+    if len(submissions) != len(ids):
+        raise ValueError("Submission not found")
+    await pay_agent_coins_batch(session, submissions)
+
+
+async def _award_reviewer_coins(session: AsyncSession, payload: dict):
+    await pay_reviewer_coins(session, payload["reviewer_id"], payload["submission_id"])
+
+
+HANDLERS = {
+    AWARD_AGENT_EVENT: _award_agent_coins,
+    AWARD_REVIEWER_EVENT: _award_reviewer_coins,
+}
+
+
+async def process_outbox_batch(session: AsyncSession, limit: int = OUTBOX_BATCH_SIZE) -> int:
+    """Handle up to `limit` pending events and commit. Returns how many were claimed."""
+    events = (await session.scalars(
+        select(OutboxEvent)
+        .where(OutboxEvent.processed_at.is_(None), OutboxEvent.attempts < OUTBOX_MAX_ATTEMPTS)
+        .order_by(OutboxEvent.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )).all()
+
+    pending = events
+    agent_events = [event for event in events if event.event_type == AWARD_AGENT_EVENT]
+    if len(agent_events) > 1:
+        try:
+            async with session.begin_nested():
+                await _award_agent_coins_batch(session, agent_events)
+        except Exception:
+            # Fall through to one event at a time so only the bad events fail
+            logger.exception("⚠️ Batched agent coin awards failed, retrying one by one")
+        else:
+            for event in agent_events:
+                event.processed_at = datetime.utcnow()
+                event.last_error = None
+            pending = [event for event in events if event.event_type != AWARD_AGENT_EVENT]
+
+    for event in pending:
+        handler = HANDLERS.get(event.event_type)
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for event type {event.event_type!r}")
+            # Savepoint per event: a failing event is rolled back on its own, not the batch
+            async with session.begin_nested():
+                await handler(session, event.payload)
+            event.processed_at = datetime.utcnow()
+            event.last_error = None
+        except Exception as e:
+            event.attempts += 1
+            event.last_error = str(getattr(e, "detail", e))
+            logger.exception("⚠️ Outbox event %s (%s) failed: %s", event.id, event.event_type, event.last_error)
+
+    await session.commit()
+    return len(events)
+
+
+async def run_outbox_worker(poll_interval: float = OUTBOX_POLL_INTERVAL):
+    """Drain the outbox until cancelled; started from the app lifespan."""
+    while True:
+        try:
+            async with async_session_maker() as session:
+                claimed = await process_outbox_batch(session)
+        except Exception:
+            logger.exception("❌ Outbox worker error")
+            claimed = 0
+
+        # A full batch means there may be more waiting: go again straight away
+        if claimed < OUTBOX_BATCH_SIZE:
+            await asyncio.sleep(poll_interval)
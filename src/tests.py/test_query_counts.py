@@ -0,0 +1,193 @@
+import os
+import asyncio
+import contextlib
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel
+
+from main import app
+from src.db import database
+from src.db.database import get_session
+from src.db.models import Project, Prompt, Task, User, AgentAllocation, Submission, Status, TaskType, ReviewerAllocation, Review
+from src.services.coins import (
+    award_coins_on_accept,
+    award_reviewer_payment,
+    get_project_coins,
+    pay_agent_coins,
+    pay_reviewer_coins,
+)
+from src.utils.analytics import get_contributor_stats, get_reviewer_stats, get_daily_stats, user_stats_cache
+
+
+# These tests create and drop tables, so they only run against a dedicated database.
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL_ASYNC")
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL_ASYNC not set")
+
+
+@contextlib.contextmanager
+def count_queries(engine):
+    """Collect every statement sent to the database while the block runs."""
+    queries = []
+
+    def hook(conn, cursor, statement, *args):
+        queries.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", hook)
+    try:
+        yield queries
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", hook)
+
+
+async def _reset_and_seed(engine, n_submissions: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with async_sessionmaker(bind=engine, expire_on_commit=False)() as session:
+        session.add_all([
+            Project(id="p1", name="project"),
+            User(id="u1", name="Agent", email="agent@example.com"),
+        ])
+        await session.flush()
+        for i in range(n_submissions):
+            session.add(Prompt(id=f"prompt-{i}", project_id="p1", text=f"sentence {i}"))
+            await session.flush()
+            session.add(Task(id=f"task-{i}", project_id="p1", prompt_id=f"prompt-{i}"))
+            await session.flush()
+            session.add(AgentAllocation(id=f"alloc-{i}", project_id="p1", task_id=f"task-{i}", user_id="u1", user_email="agent@example.com"))
+            await session.flush()
+            session.add(Submission(
+                id=f"sub-{i}",
+                task_id=f"task-{i}",
+                assignment_id=f"alloc-{i}",
+                user_id="u1",
+                type=TaskType.text,
+                status=Status.submitted,
+            ))
+        await session.commit()
+
+
+@pytest.fixture
+def db():
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def override_get_session():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    yield engine
+    app.dependency_overrides.pop(get_session, None)
+    asyncio.run(engine.dispose())
+
+
+def _list_submissions_query_count(engine, n_submissions: int) -> int:
+    asyncio.run(_reset_and_seed(engine, n_submissions))
+    client = TestClient(app)
+    with count_queries(engine) as queries:
+        response = client.get("/api/v1/submission/all/agent", params={"project_id": "p1"})
+    assert response.status_code == 200
+    assert len(response.json()) == n_submissions
+    return len(queries)
+
+
+def test_list_submissions_query_count_is_independent_of_rows(db):
+    single = _list_submissions_query_count(db, 1)
+    many = _list_submissions_query_count(db, 100)
+    assert many == single == 1
+
+
+def test_coin_awards_query_counts(db):
+    asyncio.run(_reset_and_seed(db, 1))
+    session_maker = async_sessionmaker(bind=db, expire_on_commit=False)
+
+    async def run():
+        async with session_maker() as session:
+            session.add(User(id="r1", name="Reviewer", email="reviewer@example.com"))
+            await session.flush()
+            session.add(ReviewerAllocation(id="ra-0", submission_id="sub-0", reviewer_id="r1", status=Status.accepted))
+            submission = await session.get(Submission, "sub-0")
+            submission.status = Status.accepted
+            await session.commit()
+
+        # Request path: awards are only queued, nothing is sent until the caller commits
+        async with session_maker() as session:
+            with count_queries(db) as queries:
+                await award_coins_on_accept(session, submission)
+                await award_reviewer_payment(session, "r1", "sub-0")
+            assert len(queries) == 0
+
+        async with session_maker() as session:
+            # Worker path: allocation lookup + insert (coin rate cached), and one INSERT ... SELECT
+            await get_project_coins(session, "p1")
+            with count_queries(db) as queries:
+                assert await pay_agent_coins(session, submission) is not None
+            assert len(queries) <= 2
+            with count_queries(db) as queries:
+                assert await pay_reviewer_coins(session, "r1", "sub-0") is not None
+            assert len(queries) == 1
+
+    asyncio.run(run())
+
+
+def _stats_query_counts(engine, monkeypatch, n_submissions: int) -> dict:
+    asyncio.run(_reset_and_seed(engine, n_submissions))
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    # Concurrent analytics reads open their own sessions through run_out_of_band
+    monkeypatch.setattr(database, "async_session_maker", session_maker)
+    user_stats_cache.clear()
+
+    async def run():
+        async with session_maker() as session:
+            session.add(User(id="r1", name="Reviewer", email="reviewer@example.com"))
+            await session.flush()
+            for i in range(n_submissions):
+                session.add(ReviewerAllocation(id=f"ra-{i}", submission_id=f"sub-{i}", reviewer_id="r1"))
+                session.add(Review(id=f"review-{i}", submission_id=f"sub-{i}", reviewer_id="r1", decision=Status.accepted))
+            await session.commit()
+
+        counts = {}
+        async with session_maker() as session:
+            for name, stats in [
+                ("contributor", lambda: get_contributor_stats(session, "agent@example.com")),
+                ("reviewer", lambda: get_reviewer_stats(session, "reviewer@example.com")),
+                ("daily", lambda: get_daily_stats(session, 30)),
+            ]:
+                with count_queries(engine) as queries:
+                    await stats()
+                counts[name] = len(queries)
+        return counts
+
+    return asyncio.run(run())
+
+
+def test_stats_query_counts_are_independent_of_rows(db, monkeypatch):
+    single = _stats_query_counts(db, monkeypatch, 1)
+    many = _stats_query_counts(db, monkeypatch, 50)
+    assert many == single
+    assert single["daily"] == 1
+
+
+def test_append_to_empty_user_lists(db):
+    asyncio.run(_reset_and_seed(db, 0))
+
+    async def seed():
+        async with db.begin() as conn:
+            # SQL NULL languages, JSON null dialects (as /telegram/register stores them)
+            await conn.execute(text("""INSERT INTO "user" (id, name, email, role, languages, dialects, created_at, updated_at)
+                VALUES ('u2', 'New', 'new@example.com', 'agent', NULL, 'null'::jsonb, now(), now())"""))
+
+    asyncio.run(seed())
+    client = TestClient(app)
+    response = client.patch("/api/v1/user/u2/languages", json={"add_languages": ["Yoruba", "Yoruba"]})
+    assert response.status_code == 200
+    assert response.json()["languages"] == ["Yoruba"]
+    response = client.patch("/api/v1/user/u2/dialects", json={"add_dialects": ["Egba"]})
+    assert response.status_code == 200
+    assert response.json()["dialects"] == ["Egba"]
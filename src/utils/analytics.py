@@ -1,15 +1,21 @@
-from datetime import datetime, timedelta
+import asyncio
+from collections import Counter
+from datetime import datetime, time, timedelta
 from fastapi import HTTPException
 from typing import List
 from sqlmodel import select, func
+from sqlalchemy import BigInteger, cast
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.schemas.status import (
     ContributorStats,
 )
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 from src.db.models import AgentAllocation
+from src.db.database import run_out_of_band
+from src.utils.cache import TTLCache
 
 from src.db.models import (
+    utcnow,
     User,
     Project,
     AgentAllocation,
@@ -20,6 +26,13 @@ from src.db.models import (
     Review,
     ReviewerAllocation,
 )
+from src.services.coins import from_micro_coins
+
+
+# Dashboards poll these; serve repeated hits from memory for a few seconds.
+# Platform totals change slowly, per-user stats are kept fresher.
+platform_stats_cache = TTLCache(ttl=30, maxsize=1)
+user_stats_cache = TTLCache(ttl=5, maxsize=1_000)
 
 
 # ------------------- CONTRIBUTOR STATS -------------------
@@ -27,6 +40,10 @@ async def get_contributor_stats(
     session: AsyncSession, email: str, start: datetime = None, end: datetime = None
 ):
     """Return stats for a contributor across all task types (looked up by email)."""
+    cache_key = ("contributor", email, start, end)
+    cached = user_stats_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     # Step 1: Find user by email
     user_result = await session.execute(select(User).where(User.email == email))
@@ -34,54 +51,62 @@ async def get_contributor_stats(
     if not user:
         return {"error": f"No user found with email {email}"}
 
-    # Step 2a: Submissions (with allocation + project eager loaded)
+    # Step 2a: Submission counts per project, aggregated in the DB
+    # (outer join: submissions without an allocation still count towards the totals)
     sub_query = (
-        select(Submission)
-        .where(Submission.user_id == user.id)
-        .options(
-            selectinload(Submission.allocation).selectinload(AgentAllocation.project)
+        select(
+            Project.id,
+            Project.name,
+            Project.agent_amount,
+            func.count().label("total"),
+            func.count().filter(Submission.status == Status.accepted).label("approved"),
+            func.count().filter(Submission.status == Status.rejected).label("rejected"),
+            func.count().filter(Submission.status == Status.submitted).label("pending"),
         )
+        .select_from(Submission)
+        .outerjoin(AgentAllocation, AgentAllocation.id == Submission.assignment_id)
+        .outerjoin(Project, Project.id == AgentAllocation.project_id)
+        .where(Submission.user_id == user.id)
+        .group_by(Project.id)
     )
     if start:
         sub_query = sub_query.where(Submission.created_at >= start)
     if end:
         sub_query = sub_query.where(Submission.created_at <= end)
 
-    submissions: List[Submission] = (await session.execute(sub_query)).scalars().all()
-
-    # Step 2b: Allocations (with project eager loaded)
+    # Step 2b: Allocations per project
     alloc_query = (
-        select(AgentAllocation)
+        select(Project.id, Project.name, Project.agent_amount, func.count().label("number_assigned"))
+        .select_from(AgentAllocation)
+        .join(Project, Project.id == AgentAllocation.project_id)
         .where(AgentAllocation.user_id == user.id)
-        .options(selectinload(AgentAllocation.project))
+        .group_by(Project.id)
     )
-    allocations: List[AgentAllocation] = (await session.execute(alloc_query)).scalars().all()
 
-    # Step 3: Overall submission stats
-    total = len(submissions)
-    approved = sum(1 for s in submissions if s.status == Status.accepted)
-    pending = sum(1 for s in submissions if s.status == Status.submitted)
-    rejected = sum(1 for s in submissions if s.status == Status.rejected)
-
-    # Step 4: Coins earned
-    coin_query = select(CoinPayment).where(CoinPayment.user_id == user.id)
-    coin_payments: List[CoinPayment] = (await session.execute(coin_query)).scalars().all()
-
-    # Step 5: Per-project stats
-    project_stats = {}
+    # Step 2c: Coins earned per project
+    coin_query = (
+        select(CoinPayment.project_id, cast(func.sum(CoinPayment.coins_earned), BigInteger))
+        .where(CoinPayment.user_id == user.id)
+        .group_by(CoinPayment.project_id)
+    )
 
-    # Initialize all projects from allocations and submissions
-    for item in allocations + [
-        s.allocation for s in submissions if s.allocation
-    ]:
-        if not item or not item.project:
-            continue
-        project = item.project
-        key = project.id
-        if key not in project_stats:
-            project_stats[key] = {
-                "project_id": project.id,
-                "project_name": project.name,
+    # The three queries only depend on user.id: run them concurrently, each on its own connection
+    submission_result, allocation_result, coin_result = await asyncio.gather(
+        run_out_of_band(sub_query),
+        run_out_of_band(alloc_query),
+        run_out_of_band(coin_query),
+    )
+    submission_rows = submission_result.all()
+    allocation_rows = allocation_result.all()
+    coins_by_project = dict(coin_result.all())
+
+    # Step 3: Per-project stats, built in one pass over each result set
+    def project_entry(row):
+        stats = project_stats.get(row.id)
+        if stats is None:
+            stats = project_stats[row.id] = {
+                "project_id": row.id,
+                "project_name": row.name,
                 "number_assigned": 0,
                 "total": 0,
                 "approved": 0,
@@ -89,53 +114,43 @@ async def get_contributor_stats(
                 "pending": 0,
                 "total_submissions": 0,
                 "total_coins_earned": 0,
-                "total_amount_earned": 0,  # NEW
-                "agent_amount": project.agent_amount,  # store for calculation
+                "total_amount_earned": 0,
+                "agent_amount": row.agent_amount,  # store for calculation
             }
+        return stats
 
-    # Submissions contribute to totals
-    for sub in submissions:
-        alloc = sub.allocation
-        if not alloc or not alloc.project:
-            continue
-        key = alloc.project.id
-        project_stats[key]["total"] += 1
-        if sub.status == Status.accepted:
-            project_stats[key]["approved"] += 1
-        elif sub.status == Status.rejected:
-            project_stats[key]["rejected"] += 1
-        elif sub.status == Status.submitted:
-            project_stats[key]["pending"] += 1
-
-
-
-    # Allocations contribute to number assigned
-    for alloc in allocations:
-        if not alloc.project:
+    project_stats = {}
+    for row in allocation_rows:
+        project_entry(row)["number_assigned"] = row.number_assigned
+
+    # Overall submission stats are summed in the same pass
+    approved = pending = rejected = 0
+    for row in submission_rows:
+        approved += row.approved
+        pending += row.pending
+        rejected += row.rejected
+        if row.id is None:
             continue
-        key = alloc.project.id
-        project_stats[key]["number_assigned"] += 1
+        stats = project_entry(row)
+        stats["total"] = stats["total_submissions"] = row.total
+        stats["approved"] = row.approved
+        stats["rejected"] = row.rejected
+        stats["pending"] = row.pending
 
-    # Fill total_submissions, total_coins_earned, and total_amount_earned per project
+    # Fill total_coins_earned and total_amount_earned per project
     for key, stats in project_stats.items():
-        stats["total_submissions"] = sum(
-            1 for s in submissions if s.allocation and s.allocation.project.id == key
-        )
-        stats["total_coins_earned"] = sum(
-            c.coins_earned for c in coin_payments if c.project_id == key
-        )
-        stats["total_amount_earned"] = stats["total_coins_earned"] * stats["agent_amount"]
+        stats["total_coins_earned"] = from_micro_coins(coins_by_project.get(key))
+        stats["total_amount_earned"] = stats["total_coins_earned"] * stats.pop("agent_amount")
 
-        # Optional: remove agent_amount from final output if you don't want it
-        del stats["agent_amount"]
-
-    return {
+    result = {
         "user_email": email,
         "approved": approved,
         "pending": pending,
         "rejected": rejected,
         "per_project": list(project_stats.values()),
     }
+    user_stats_cache.set(cache_key, result)
+    return result
 # ------------------- CONTRIBUTOR STATS -------------------
 
 
@@ -143,6 +158,10 @@ async def get_contributor_stats(
 # ------------------- REVIEWER STATS -------------------
 async def get_reviewer_stats(session: AsyncSession, email: str, start: datetime = None, end: datetime = None):
     """Return stats for a reviewer (looked up by email)."""
+    cache_key = ("reviewer", email, start, end)
+    cached = user_stats_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     reviewer_result = await session.execute(select(User).where(User.email == email))
     reviewer = reviewer_result.scalar_one_or_none()
@@ -156,14 +175,15 @@ async def get_reviewer_stats(session: AsyncSession, email: str, start: datetime
         .options(
             selectinload(ReviewerAllocation.submission)
             .selectinload(Submission.allocation)
-            .selectinload(AgentAllocation.project)
+            .selectinload(AgentAllocation.project),
+            # Anything not eager-loaded above fails loudly instead of lazy loading per row
+            raiseload("*"),
         )
     )
     if start:
         alloc_query = alloc_query.where(ReviewerAllocation.assigned_at >= start)
     if end:
         alloc_query = alloc_query.where(ReviewerAllocation.assigned_at <= end)
-    allocations: List[ReviewerAllocation] = (await session.execute(alloc_query)).scalars().all()
 
     # 2. Fetch Reviews
     review_query = (
@@ -172,38 +192,51 @@ async def get_reviewer_stats(session: AsyncSession, email: str, start: datetime
         .options(
             selectinload(Review.submission)
             .selectinload(Submission.allocation)
-            .selectinload(AgentAllocation.project)
+            .selectinload(AgentAllocation.project),
+            raiseload("*"),
         )
     )
     if start:
         review_query = review_query.where(Review.created_at >= start)
     if end:
         review_query = review_query.where(Review.created_at <= end)
-    reviews: List[Review] = (await session.execute(review_query)).scalars().all()
 
-    # 3. Fetch Coin Payments
-    coin_query = select(CoinPayment).where(CoinPayment.user_id == reviewer.id)
-    coin_payments: List[CoinPayment] = (await session.execute(coin_query)).scalars().all()
+    # 3. Coins earned per project
+    coin_query = (
+        select(CoinPayment.project_id, cast(func.sum(CoinPayment.coins_earned), BigInteger))
+        .where(CoinPayment.user_id == reviewer.id)
+        .group_by(CoinPayment.project_id)
+    )
+
+    # Independent of each other: fetch concurrently, each on its own connection
+    alloc_result, review_result, coin_result = await asyncio.gather(
+        run_out_of_band(alloc_query),
+        run_out_of_band(review_query),
+        run_out_of_band(coin_query),
+    )
+    allocations: List[ReviewerAllocation] = alloc_result.scalars().all()
+    reviews: List[Review] = review_result.scalars().all()
+    coins_by_project = dict(coin_result.all())
 
     # --- Aggregate Stats ---
+    # One pass over the reviews for every decision count
+    decisions = Counter(r.decision for r in reviews)
     total_reviewed = len(reviews)
-    approved = sum(1 for r in reviews if r.decision == Status.accepted)
-    rejected = sum(1 for r in reviews if r.decision == Status.rejected)
+    approved = decisions[Status.accepted]
+    rejected = decisions[Status.rejected]
     # FIX 1: Calculate the number of pending reviews
     pending = total_reviewed - (approved + rejected)
 
     # --- Per-project stats ---
+    # Projects come from the reviewer's allocations: create and count in the same pass
     project_stats = {}
-
-    all_related_items = allocations + [r.submission for r in reviews if r.submission]
-    for item in all_related_items:
-        project = item.submission.allocation.project if hasattr(item, 'submission') and item.submission and item.submission.allocation else None
+    for alloc in allocations:
+        project = alloc.submission.allocation.project if alloc.submission and alloc.submission.allocation else None
         if not project:
             continue
-        
-        key = project.id
-        if key not in project_stats:
-            project_stats[key] = {
+        stats = project_stats.get(project.id)
+        if stats is None:
+            stats = project_stats[project.id] = {
                 "project_id": project.id,
                 "project_name": project.name,
                 "number_assigned": 0,
@@ -215,11 +248,7 @@ async def get_reviewer_stats(session: AsyncSession, email: str, start: datetime
                 "total_amount_earned": 0,
                 "reviewer_amount": project.reviewer_amount,
             }
-
-    for alloc in allocations:
-        project = alloc.submission.allocation.project if alloc.submission and alloc.submission.allocation else None
-        if project and project.id in project_stats:
-            project_stats[project.id]["number_assigned"] += 1
+        stats["number_assigned"] += 1
 
     for review in reviews:
         project = review.submission.allocation.project if review.submission and review.submission.allocation else None
@@ -235,12 +264,12 @@ async def get_reviewer_stats(session: AsyncSession, email: str, start: datetime
                 stats["pending"] += 1
 
     for key, stats in project_stats.items():
-        stats["total_coins_earned"] = sum(c.coins_earned for c in coin_payments if c.project_id == key)
+        stats["total_coins_earned"] = from_micro_coins(coins_by_project.get(key))
         stats["total_amount_earned"] = stats["total_coins_earned"] * stats["reviewer_amount"]
         del stats["reviewer_amount"]
 
     # FIX 4: Add the missing 'pending_reviews' field to the final response
-    return {
+    result = {
         "reviewer_email": email,
         "total_reviewed": total_reviewed,
         "approved_reviews": approved,
@@ -248,110 +277,8 @@ async def get_reviewer_stats(session: AsyncSession, email: str, start: datetime
         "pending_reviews": pending, # This field was missing
         "per_project": list(project_stats.values()),
     }
-
-
-
-# async def get_reviewer_stats(session: AsyncSession, email: str, start: datetime = None, end: datetime = None):
-#     """Return stats for a reviewer (looked up by email)."""
-
-#     reviewer_result = await session.execute(select(User).where(User.email == email))
-#     reviewer = reviewer_result.scalar_one_or_none()
-#     if not reviewer:
-#         return {"error": f"No reviewer found with email {email}"}
-
-#     # 1️⃣ Number of review tasks assigned
-#     alloc_query = (
-#         select(ReviewerAllocation)
-#         .where(ReviewerAllocation.reviewer_id == reviewer.id)
-#         .options(
-#             selectinload(ReviewerAllocation.submission)
-#             .selectinload(Submission.allocation)
-#             .selectinload(AgentAllocation.project)
-#         )
-#     )
-#     if start:
-#         alloc_query = alloc_query.where(ReviewerAllocation.assigned_at >= start)
-#     if end:
-#         alloc_query = alloc_query.where(ReviewerAllocation.assigned_at <= end)
-
-#     allocations: List[ReviewerAllocation] = (await session.execute(alloc_query)).scalars().all()
-
-#     # 2️⃣ Reviews actually completed
-#     review_query = (
-#         select(Review)
-#         .where(Review.reviewer_id == reviewer.id)
-#         .options(
-#             selectinload(Review.submission)
-#             .selectinload(Submission.allocation)
-#             .selectinload(AgentAllocation.project)
-#         )
-#     )
-#     if start:
-#         review_query = review_query.where(Review.created_at >= start)
-#     if end:
-#         review_query = review_query.where(Review.created_at <= end)
-
-#     reviews: List[Review] = (await session.execute(review_query)).scalars().all()
-
-#     total_reviewed = len(reviews)
-#     approved = sum(1 for r in reviews if r.decision == Status.accepted)
-#     rejected = sum(1 for r in reviews if r.decision == Status.rejected)
-#     pending = sum(1 for r in reviews if r.decision is None)
-
-#     # Per-project stats
-#     project_stats = {}
-#     # number assigned per project
-#     for alloc in allocations:
-#         submission = alloc.submission
-#         project = submission.allocation.project if submission and submission.allocation else None
-#         if not project:
-#             continue
-#         key = project.id
-#         if key not in project_stats:
-#             project_stats[key] = {
-#                 "project_id": project.id,
-#                 "project_name": project.name,
-#                 "number_assigned": 0,
-#                 "total_reviewed": 0,
-#                 "approved": 0,
-#                 "rejected": 0,
-#                 "pending": 0,
-#             }
-#         project_stats[key]["number_assigned"] += 1
-
-#     # add completed reviews per project
-#     for review in reviews:
-#         submission = review.submission
-#         project = submission.allocation.project if submission and submission.allocation else None
-#         if not project:
-#             continue
-#         key = project.id
-#         if key not in project_stats:
-#             project_stats[key] = {
-#                 "project_id": project.id,
-#                 "project_name": project.name,
-#                 "number_assigned": 0,
-#                 "total_reviewed": 0,
-#                 "approved": 0,
-#                 "rejected": 0,
-#                 "pending": 0,
-#             }
-#         project_stats[key]["total_reviewed"] += 1
-#         if review.decision == Status.accepted:
-#             project_stats[key]["approved"] += 1
-#         elif review.decision == Status.rejected:
-#             project_stats[key]["rejected"] += 1
-#         else:
-#             project_stats[key]["pending"] += 1
-
-#     return {
-#         "reviewer_email": email,
-#         "total_reviewed": total_reviewed,
-#         "approved_reviews": approved,
-#         "rejected_reviews": rejected,
-#         "pending_reviews": pending,
-#         "per_project": list(project_stats.values()),
-#     }
+    user_stats_cache.set(cache_key, result)
+    return result
 
 
 
@@ -363,23 +290,34 @@ async def get_reviewer_stats(session: AsyncSession, email: str, start: datetime
 # ------------------- PLATFORM STATS -------------------
 async def get_platform_stats(session: AsyncSession):
     """Overall platform stats."""
-
-    total_users = (await session.execute(select(func.count()).select_from(User))).scalar()
-    total_projects = (await session.execute(select(func.count()).select_from(Project))).scalar()
-    total_allocations = (await session.execute(select(func.count()).select_from(AgentAllocation))).scalar()
-
-    submissions_result = await session.execute(select(Submission))
-    submissions: List[Submission] = submissions_result.scalars().all()
-    total_subs = len(submissions)
-    approved = sum(1 for s in submissions if s.status == Status.accepted)
-    rejected = sum(1 for s in submissions if s.status == Status.rejected)
-    pending = sum(1 for s in submissions if s.status == Status.submitted)
-
-    coins_result = await session.execute(select(CoinPayment))
-    coin_payments: List[CoinPayment] = coins_result.scalars().all()
-    total_coins = sum(c.coins_earned for c in coin_payments)
-
-    return {
+    cached = platform_stats_cache.get("platform")
+    if cached is not None:
+        return cached
+
+    # Every total in one round trip: one scalar subquery per table, counted in the DB
+    submission_counts = select(
+        func.count(),
+        func.count().filter(Submission.status == Status.accepted),
+        func.count().filter(Submission.status == Status.rejected),
+        func.count().filter(Submission.status == Status.submitted),
+    ).subquery()
+    row = (await session.execute(
+        select(
+            select(func.count()).select_from(User).scalar_subquery(),
+            select(func.count()).select_from(Project).scalar_subquery(),
+            select(func.count()).select_from(AgentAllocation).scalar_subquery(),
+            *submission_counts.c,
+            select(cast(func.sum(CoinPayment.coins_earned), BigInteger)).scalar_subquery(),
+        )
+    )).one()
+    (
+        total_users, total_projects, total_allocations,
+        total_subs, approved, rejected, pending,
+        total_coin_micro,
+    ) = row
+    total_coins = from_micro_coins(total_coin_micro)
+
+    result = {
         "total_users": total_users,
         "total_projects": total_projects,
         "total_allocations": total_allocations,
@@ -389,34 +327,39 @@ async def get_platform_stats(session: AsyncSession):
         "pending_review_submissions": pending,
         "total_coins_paid": total_coins,
     }
+    platform_stats_cache.set("platform", result)
+    return result
 
 # ------------------- DAILY STATS -------------------
 async def get_daily_stats(session: AsyncSession, days: int = 7):
     """Stats per day (last N days)."""
 
-    today = datetime.utcnow().date()
-    daily_data = []
+    today = utcnow().date()
+    first_day = today - timedelta(days=days - 1)
+    window_start = datetime.combine(first_day, time.min)
+    window_end = datetime.combine(today, time.min) + timedelta(days=1)
+
+    # One grouped query for the whole window instead of one query per day
+    day_bucket = func.date_trunc("day", Submission.created_at).label("day")
+    rows = (await session.execute(
+        select(day_bucket, Submission.type, func.count())
+        .where(Submission.created_at >= window_start)
+        .where(Submission.created_at < window_end)
+        .group_by(day_bucket, Submission.type)
+    )).all()
+    counts = {(bucket.date(), task_type): count for bucket, task_type, count in rows}
 
+    daily_data = []
     for i in range(days):
         day = today - timedelta(days=i)
-        start_of_day = datetime(day.year, day.month, day.day)
-        end_of_day = start_of_day + timedelta(days=1)
-
-        subs_result = await session.execute(
-            select(Submission).where(
-                Submission.created_at >= start_of_day,
-                Submission.created_at < end_of_day
-            )
-        )
-        subs: List[Submission] = subs_result.scalars().all()
-
+        per_type = {task_type: counts.get((day, task_type), 0) for task_type in TaskType}
         daily_data.append({
             "date": str(day),
-            "audio_submissions": sum(1 for s in subs if s.type == TaskType.audio),
-            "text_submissions": sum(1 for s in subs if s.type == TaskType.text),
-            "image_submissions": sum(1 for s in subs if s.type == TaskType.image),
-            "video_submissions": sum(1 for s in subs if s.type == TaskType.video),
-            "total_submissions": len(subs),
+            "audio_submissions": per_type[TaskType.audio],
+            "text_submissions": per_type[TaskType.text],
+            "image_submissions": per_type[TaskType.image],
+            "video_submissions": per_type[TaskType.video],
+            "total_submissions": sum(per_type.values()),
         })
 
     return daily_data
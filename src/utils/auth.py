@@ -1,6 +1,9 @@
 from passlib.context import CryptContext
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+import multiprocessing
+import asyncio
 import jwt, os
 import logging
 
@@ -11,6 +14,10 @@ logger = logging.getLogger(__name__)
 
 pwd_context = CryptContext(schemes=["bcrypt"])
 
+# HS256 key and algorithm list prepared once instead of on every encode/decode
+_JWT_KEY = SECRET_KEY.encode()
+_JWT_ALGORITHMS = [ALGORITHM]
+
 
 
 
@@ -25,6 +32,45 @@ def get_password_hash(password: str):
     return pwd_context.hash(password)
 
 
+# bcrypt is deliberately slow CPU work; run it in worker processes so it neither
+# blocks the event loop nor serializes on the GIL. Started/stopped by the app lifespan.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+_hash_pool: Optional[ProcessPoolExecutor] = None
+# Bounds how many hash jobs queue up: a login storm waits here instead of piling
+# thousands of pickled jobs onto the pool
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", str(PASSWORD_HASH_WORKERS * 2)))
+_hash_slots = asyncio.Semaphore(PASSWORD_HASH_QUEUE)
+
+
+def start_hash_pool():
+    global _hash_pool
+    if _hash_pool is None:
+        # spawn: don't fork a process that holds the event loop and DB connections
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+
+def shutdown_hash_pool():
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(cancel_futures=True)
+        _hash_pool = None
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash off the event loop (worker process, or a thread if the pool isn't started)."""
+    async with _hash_slots:
+        return await asyncio.get_running_loop().run_in_executor(_hash_pool, get_password_hash, password)
+
+
+async def verify_password_async(password: str, hash: str) -> bool:
+    """verify_password off the event loop (worker process, or a thread if the pool isn't started)."""
+    async with _hash_slots:
+        return await asyncio.get_running_loop().run_in_executor(_hash_pool, verify_password, password, hash)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -32,12 +78,12 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _JWT_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def decode_access_token(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS)
         return payload
     except jwt.PyJWTError as e:
         logging.exception(e)
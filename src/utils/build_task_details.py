@@ -1,6 +1,7 @@
 from typing import Optional, List
 from src.schemas.project_schemas import TaskWithDetails, PromptInfo, SubmissionInfo, ReviewInfo, ReviewerInfo, TaskWithDetailsReview
 from src.db.models import Task, AgentAllocation, Submission, ReviewerAllocation, Review, CoinPayment
+from src.services.coins import from_micro_coins
 
 
 
@@ -19,28 +20,36 @@ async def build_task_details(
     is_reviewer: bool = False
 ) -> TaskWithDetails:
 
+    prompt = task.prompt
+    # The agent allocation when there is one, otherwise the reviewer's
+    assignment = alloc or rev_alloc
+
     # Contributor submission
     submission_info = None
     if submission:
         # ✅ fallback: if payload_text is empty, use prompt sentence
         payload_text = submission.payload_text
-        if (not payload_text or payload_text.strip() == "") and task.prompt:
-            payload_text = task.prompt.text
+        if (not payload_text or payload_text.isspace()) and prompt:
+            payload_text = prompt.text
+
+    # Values come straight from loaded ORM rows, so build the response models with
+    # model_construct: skips a validation pass per nested model on large task lists
+    # (FastAPI still checks the final response against the route's response_model)
 
     # Prompt details
-    prompt_info = PromptInfo(
-        prompt_id=task.prompt.id if task.prompt else None,
-        sentence_id=task.prompt.id if task.prompt else None,
-        sentence_text=task.prompt.text if task.prompt else None,
-        media_url=task.prompt.media_url if task.prompt else None,
-        category=task.prompt.category if task.prompt else None,
-        domain=task.prompt.domain if task.prompt else None,
-        max_reuses=task.prompt.max_reuses if task.prompt else None,
-        current_reuses=task.prompt.current_reuses if task.prompt else None
-    ) if task.prompt else None
+    prompt_info = PromptInfo.model_construct(
+        prompt_id=prompt.id,
+        sentence_id=prompt.id,
+        sentence_text=prompt.text,
+        media_url=prompt.media_url,
+        category=prompt.category,
+        domain=prompt.domain,
+        max_reuses=prompt.max_reuses,
+        current_reuses=prompt.current_reuses
+    ) if prompt else None
 
     # Contributor submission
-    submission_info = SubmissionInfo(
+    submission_info = SubmissionInfo.model_construct(
         submission_id=submission.id,
         user_id=submission.user_id,
         user_email=user_email,
@@ -55,43 +64,63 @@ async def build_task_details(
     # Reviewer details (all allocations)
     reviewers_info: List[ReviewerInfo] = []
     if submission and submission.review_allocations:
+        # Index reviews by reviewer once (first review wins) instead of scanning per allocation
+        reviews_by_reviewer = {}
+        for r in submission.reviews:
+            reviews_by_reviewer.setdefault(r.reviewer_id, r)
+
+        # Loop-invariant: the payment only ever belongs to one reviewer
+        payment_user_id = payment.user_id if payment else None
+        append = reviewers_info.append
         for ra in submission.review_allocations:
+            reviewer_id = ra.reviewer_id
             # Find review for this reviewer
-            reviewer_review = next((r for r in submission.reviews if r.reviewer_id == ra.reviewer_id), None)
-            # Find payment for this reviewer-task pair
-            reviewer_payment = payment if payment and payment.user_id == ra.reviewer_id else None
-
-            reviewers_info.append(ReviewerInfo(
-                reviewer_id=ra.reviewer_id,
-                reviewer_email=ra.reviewer.email if ra.reviewer else None,
-                review_scores=reviewer_review.scores if reviewer_review else None,
-                review_total_score=reviewer_review.total_score if reviewer_review else None,
-                review_decision=reviewer_review.decision.value if reviewer_review and reviewer_review.decision else ra.status.value,
-                review_comments=reviewer_review.comments if reviewer_review else None,
-                total_coins_earned=reviewer_payment.coins_earned if reviewer_payment else 0
+            reviewer_review = reviews_by_reviewer.get(reviewer_id)
+            reviewer = ra.reviewer
+            if reviewer_review:
+                decision = reviewer_review.decision
+                scores, total_score, comments = reviewer_review.scores, reviewer_review.total_score, reviewer_review.comments
+            else:
+                decision = scores = total_score = comments = None
+
+            append(ReviewerInfo.model_construct(
+                reviewer_id=reviewer_id,
+                reviewer_email=reviewer.email if reviewer else None,
+                review_scores=scores,
+                review_total_score=total_score,
+                review_decision=(decision or ra.status).value,
+                review_comments=comments,
+                # Payment for this reviewer-task pair
+                total_coins_earned=from_micro_coins(payment.coins_earned) if payment_user_id == reviewer_id else 0
             ))
 
-    review_info = ReviewInfo(reviewers=reviewers_info) if reviewers_info else None
+    review_info = ReviewInfo.model_construct(reviewers=reviewers_info) if reviewers_info else None
+
+    # Assignment fields are shared by both response shapes
+    if assignment:
+        assignment_id, assigned_at, status = assignment.id, assignment.assigned_at, assignment.status.value
+    else:
+        assignment_id = assigned_at = status = None
 
     if is_reviewer:
 
-        return TaskWithDetailsReview(
+        return TaskWithDetailsReview.model_construct(
             task_id=task.id,
-            assignment_id=alloc.id if alloc else (rev_alloc.id if rev_alloc else None),
-            assigned_at=alloc.assigned_at if alloc else (rev_alloc.assigned_at if rev_alloc else None),
-            status=alloc.status.value if alloc else (rev_alloc.status.value if rev_alloc else None),
+            assignment_id=assignment_id,
+            assigned_at=assigned_at,
+            status=status,
             prompt=prompt_info,
             submission=submission_info
         )
     else:
 
-        return TaskWithDetails(
+        return TaskWithDetails.model_construct(
             task_id=task.id,
-            assignment_id=alloc.id if alloc else (rev_alloc.id if rev_alloc else None),
-            assigned_at=alloc.assigned_at if alloc else (rev_alloc.assigned_at if rev_alloc else None),
-            status=alloc.status.value if alloc else (rev_alloc.status.value if rev_alloc else None),
+            assignment_id=assignment_id,
+            assigned_at=assigned_at,
+            status=status,
             prompt=prompt_info,
             submission=submission_info,
             review=review_info,
             user_email=user_email
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,40 @@
+import time
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    Small in-process cache whose entries expire after `ttl` seconds.
+
+    Each worker process keeps its own copy and cannot see another worker's
+    invalidations, so only use it for data where a few seconds of staleness
+    is acceptable, and keep the TTL short.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 10_000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if key not in self._data and len(self._data) >= self.maxsize:
+            # Evict the oldest insertion (dicts keep insertion order)
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def delete(self, *keys: Hashable) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -1,39 +1,64 @@
 import aiohttp
+import logging
 import uuid
 from fastapi import HTTPException
 
 
-from src.utils.s3 import upload_file_to_s3
+from src.utils.s3 import upload_stream_to_s3
 from src.config import BOT_TOKEN
 
 
 TELEGRAM_BOT_TOKEN = BOT_TOKEN 
 
+logger = logging.getLogger(__name__)
+
+# One HTTP session for the whole process so Telegram downloads reuse its
+# connections (and their TLS handshakes) instead of opening new ones per file
+_telegram_session: aiohttp.ClientSession | None = None
+
+
+def get_telegram_session() -> aiohttp.ClientSession:
+    """Return the shared Telegram HTTP session, creating it on first use."""
+    global _telegram_session
+    if _telegram_session is None or _telegram_session.closed:
+        _telegram_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
+        )
+    return _telegram_session
+
+
+async def close_telegram_session():
+    """Close the shared Telegram HTTP session (called on application shutdown)."""
+    global _telegram_session
+    if _telegram_session is not None:
+        await _telegram_session.close()
+    _telegram_session = None
+
 
 async def fetch_and_upload_from_telegram(file_id: str, folder: str) -> str:
     """
     Download a Telegram file using its file_id and upload to S3.
     """
-    print(f"Downloading file from Telegram with file_id {file_id}")
-    async with aiohttp.ClientSession() as session:
-        # Step 1: Get file path from Telegram
-        async with session.get(
-            f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/getFile?file_id={file_id}"
-        ) as resp:
-            data = await resp.json()
-            if not data.get("ok"):
-                raise HTTPException(status_code=400, detail="Invalid Telegram file_id")
-            file_path = data["result"]["file_path"]
-
-        # Step 2: Download file
-        file_url = f"https://api.telegram.org/file/bot{TELEGRAM_BOT_TOKEN}/{file_path}"
-        async with session.get(file_url) as resp:
-            content = await resp.read()
-
-        # Step 3: Upload to S3
-        ext = file_path.split(".")[-1]
-        unique_name = f"{folder}/{uuid.uuid4().hex}.{ext}"
-        s3_path = await upload_file_to_s3(content, unique_name, f"audio/{ext}")
-        if not s3_path:
-            raise HTTPException(status_code=500, detail="Failed to upload Telegram file to S3")
-        return s3_path
+    logger.info("Downloading file from Telegram with file_id %s", file_id)
+    session = get_telegram_session()
+
+    # Step 1: Get file path from Telegram
+    async with session.get(
+        f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/getFile?file_id={file_id}"
+    ) as resp:
+        data = await resp.json()
+        if not data.get("ok"):
+            raise HTTPException(status_code=400, detail="Invalid Telegram file_id")
+        file_path = data["result"]["file_path"]
+
+    # Step 2: Stream the download straight into S3
+    ext = file_path.split(".")[-1]
+    unique_name = f"{folder}/{uuid.uuid4().hex}.{ext}"
+    file_url = f"https://api.telegram.org/file/bot{TELEGRAM_BOT_TOKEN}/{file_path}"
+    async with session.get(file_url) as resp:
+        s3_path = await upload_stream_to_s3(
+            resp.content.iter_chunked(64 * 1024), unique_name, f"audio/{ext}"
+        )
+    if not s3_path:
+        raise HTTPException(status_code=500, detail="Failed to upload Telegram file to S3")
+    return s3_path
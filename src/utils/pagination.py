@@ -0,0 +1,23 @@
+import base64
+import binascii
+from datetime import datetime
+from fastapi import HTTPException
+
+# Response header carrying the cursor for the next page (absent on the last page), so
+# list endpoints keep returning a plain JSON list
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """Opaque keyset cursor for the row (created_at, id) a page ended on."""
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Inverse of encode_cursor; a malformed cursor is a 400."""
+    try:
+        created_at, id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), id
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
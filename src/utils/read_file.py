@@ -1,73 +1,61 @@
+import asyncio
 import pandas as pd
+from openpyxl import load_workbook
 from io import BytesIO, StringIO
 from fastapi import UploadFile, HTTPException
 
 
-async def read_uploaded_dataframe(file: UploadFile, required_cols: set[str] | None = None) -> pd.DataFrame:
-    import pandas as pd
-    from io import BytesIO, StringIO
-    from fastapi import UploadFile, HTTPException
+def _read_columns(content: bytes, filename: str) -> list:
+    """Column names from the header row only, without parsing the data rows."""
+    if filename.endswith(".csv"):
+        try:
+            return list(pd.read_csv(BytesIO(content), nrows=0, encoding="utf-8").columns)
+        except UnicodeDecodeError:
+            return list(pd.read_csv(BytesIO(content), nrows=0, encoding="windows-1252").columns)
+    elif filename.endswith(".xlsx"):
+        # read_only streams the sheet, so only the first row is loaded
+        workbook = load_workbook(BytesIO(content), read_only=True)
+        try:
+            header = next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+        finally:
+            workbook.close()
+        return [name for name in header if name is not None]
+    raise HTTPException(status_code=400, detail="Unsupported file type. Upload .csv or .xlsx")
+
+
+def _parse_dataframe(content: bytes, filename: str) -> pd.DataFrame:
+    """Parse CSV/XLSX bytes into a DataFrame (CPU-bound, run off the event loop)."""
+    if filename.endswith(".csv"):
+        # Try UTF-8, fallback to Windows-1252 (common in Excel exports)
+        try:
+            return pd.read_csv(StringIO(content.decode("utf-8")))
+        except UnicodeDecodeError:
+            return pd.read_csv(StringIO(content.decode("windows-1252")))
+    elif filename.endswith(".xlsx"):
+        return pd.read_excel(BytesIO(content), engine="openpyxl")
+    raise HTTPException(status_code=400, detail="Unsupported file type. Upload .csv or .xlsx")
+
 
+async def read_uploaded_dataframe(file: UploadFile, required_cols: set[str] | None = None) -> pd.DataFrame:
     filename = file.filename.lower()
     content = await file.read()
 
     try:
-        if filename.endswith(".csv"):
-            # Try UTF-8, fallback to Windows-1252 (common in Excel exports)
-            try:
-                df = pd.read_csv(StringIO(content.decode("utf-8")))
-            except UnicodeDecodeError:
-                df = pd.read_csv(StringIO(content.decode("windows-1252")))
-        elif filename.endswith(".xlsx"):
-            df = pd.read_excel(BytesIO(content), engine="openpyxl")
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file type. Upload .csv or .xlsx")
+        # Check the header before parsing every row, so uploads missing a column fail fast
+        columns = await asyncio.to_thread(_read_columns, content, filename) if required_cols else None
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
 
-    if df.empty:
-        raise HTTPException(status_code=400, detail="Uploaded file is empty")
-
-    if required_cols and not required_cols.issubset(df.columns):
+    if columns is not None and not required_cols.issubset(columns):
         raise HTTPException(status_code=400, detail=f"File must contain columns: {required_cols}")
-    
-    # if required_cols:
-    #     required_cols = set(required_cols)  # ✅ ensure it’s a set
-    #     if not required_cols.issubset(df.columns):
-    #         raise HTTPException(status_code=400, detail=f"File must contain columns: {required_cols}")
-
-
-    return df
-
 
-# async def read_uploaded_dataframe(file: UploadFile, required_cols: set[str] | None = None) -> pd.DataFrame:
-
-#     """
-#     Read uploaded file (Excel or CSV) into a pandas DataFrame.
-
-#     Supported formats:
-#       - .xlsx (Excel)
-#       - .csv (Comma-separated)
-#     Raises HTTPException 400 if format is unsupported or file can't be read.
-#     """
-#     filename = file.filename.lower()
-#     content = await file.read()
-
-#     try:
-#         if filename.endswith(".csv"):
-#             # decode bytes to string before reading CSV
-#             df = pd.read_csv(StringIO(content.decode("utf-8")))
-#         elif filename.endswith(".xlsx"):
-#             df = pd.read_excel(BytesIO(content), engine="openpyxl")
-#         else:
-#             raise HTTPException(status_code=400, detail="Unsupported file type. Upload .csv or .xlsx")
-#     except Exception as e:
-#         raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
-
-#     if df.empty:
-#         raise HTTPException(status_code=400, detail="Uploaded file is empty")
+    try:
+        # pandas parsing can take hundreds of ms on big uploads: keep it off the event loop
+        df = await asyncio.to_thread(_parse_dataframe, content, filename)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
 
-#     if required_cols and not required_cols.issubset(df.columns):
-#       raise HTTPException(status_code=400, detail=f"File must contain columns: {required_cols}")
+    if df.empty:
+        raise HTTPException(status_code=400, detail="Uploaded file is empty")
 
-#     return df
+    return df
@@ -1,98 +1,123 @@
-import random
+import logging
 from typing import Optional
-from fastapi import HTTPException, Depends
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from sqlmodel import select, func
-from datetime import datetime
 
 from src.db.models import (
     Project,
     Status,
     ReviewerAllocation,
-    Submission,
     ProjectReviewer,
-    Task
+    User,
 )
+from src.db.database import async_session_maker
+
+logger = logging.getLogger(__name__)
 
 
 
 async def auto_assign_reviewer(
     project_id: str,
-    submission: Submission,
+    submission_id: str,
     session: AsyncSession,
 ) -> Optional[str]:
     """
     Automatically assigns an available reviewer to a submission
     based on reviewer pool and workload capacity (per project).
+
+    The allocation is only flushed: the caller commits, which also releases
+    the project row lock taken here.
     """
 
-    # 1️⃣ Load project with its reviewers
-    project_stmt = (
-        select(Project)
-        .options(
-            selectinload(Project.project_reviewers)
-            .selectinload(ProjectReviewer.reviewer)
-        )
+    # 1️⃣ Serialize auto-assignments per project with a short blocking lock on the
+    # project row (NO KEY UPDATE: inserts referencing the project aren't blocked).
+    # Concurrent assignments wait here instead of skipping reviewers, and the pick
+    # below runs as a new statement, so it sees the allocation they committed.
+    reviewer_quota = await session.scalar(
+        select(Project.reviewer_quota)
         .where(Project.id == project_id)
+        .with_for_update(key_share=True)
     )
-    project_result = await session.execute(project_stmt)
-    project = project_result.scalars().first()
-
-    if not project:
+    if reviewer_quota is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # 2️⃣ Extract active reviewers
-    project_reviewers = [
-        pr.reviewer for pr in project.project_reviewers if pr.active and pr.reviewer
-    ]
-    if not project_reviewers:
-        raise HTTPException(status_code=400, detail="No active reviewers for this project")
-
-    # 3️⃣ Count reviewer workloads (only within this project)
-    load_stmt = (
-        select(
-            ReviewerAllocation.reviewer_id,
-            func.count(ReviewerAllocation.id).label("load_count")
+    # 2️⃣ Reviewer workload within this project, as a correlated count per reviewer
+    load_count = (
+        select(func.count())
+        .where(
+            ReviewerAllocation.project_id == project_id,
+            ReviewerAllocation.reviewer_id == ProjectReviewer.reviewer_id,
         )
-        .join(Submission, Submission.id == ReviewerAllocation.submission_id)
-        .join(Task, Task.id == Submission.task_id)
-        .where(Task.project_id == project_id)
-        .group_by(ReviewerAllocation.reviewer_id)
+        .correlate(ProjectReviewer)
+        .scalar_subquery()
     )
-    load_result = await session.execute(load_stmt)
-    reviewer_loads = {row.reviewer_id: row.load_count for row in load_result}
-
-    # 4️⃣ Filter reviewers below project quota
-    available_reviewers = [
-        reviewer for reviewer in project_reviewers
-        if reviewer_loads.get(reviewer.id, 0) < project.reviewer_quota
-    ]
-    if not available_reviewers:
+
+    # 3️⃣ Least-loaded active reviewer still under the project quota
+    pick_stmt = (
+        select(User.id, User.email)
+        .select_from(ProjectReviewer)
+        .join(User, User.id == ProjectReviewer.reviewer_id)
+        .where(
+            ProjectReviewer.project_id == project_id,
+            ProjectReviewer.active == True,
+            load_count < reviewer_quota,
+        )
+        .order_by(load_count, ProjectReviewer.created_at)
+        .limit(1)
+    )
+    selected_reviewer = (await session.execute(pick_stmt)).first()
+
+    if not selected_reviewer:
+        # Only on failure: work out which error to report
+        has_reviewers = await session.scalar(
+            select(ProjectReviewer.id)
+            .where(ProjectReviewer.project_id == project_id, ProjectReviewer.active == True)
+            .limit(1)
+        )
+        if not has_reviewers:
+            raise HTTPException(status_code=400, detail="No active reviewers for this project")
         raise HTTPException(
             status_code=400,
             detail="All reviewers have reached their maximum capacity for this project"
         )
 
-    # 5️⃣ Pick the least-loaded reviewer (balanced)
-    selected_reviewer = min(
-        available_reviewers,
-        key=lambda r: reviewer_loads.get(r.id, 0)
-    )
-
-    print(f"🔍 Assigning submission {submission.id} to reviewer {selected_reviewer.email}")
+    logger.info("🔍 Assigning submission %s to reviewer %s", submission_id, selected_reviewer.email)
 
-    # 6️⃣ Create reviewer allocation
+    # 4️⃣ Create reviewer allocation
     review_alloc = ReviewerAllocation(
-        submission_id=submission.id,
+        submission_id=submission_id,
         reviewer_id=selected_reviewer.id,
+        project_id=project_id,
         status=Status.pending,
-        assigned_at=datetime.utcnow()
+        # Database clock (naive UTC, like the column): consistent across app instances
+        assigned_at=func.timezone("UTC", func.now()),
     )
     session.add(review_alloc)
-    await session.commit()
+    await session.flush()
 
-    print(f"✅ Submission {submission.id} assigned to {selected_reviewer.email}")
     return selected_reviewer.email
 
 
+
+
+
+async def auto_assign_reviewer_in_background(project_id: str, submission_id: str) -> None:
+    """
+    Run auto_assign_reviewer after the response has been sent (FastAPI BackgroundTasks).
+    The request's session is closed by then, so this opens its own; failures are
+    logged since there is no client left to report them to.
+    """
+    async with async_session_maker() as session:
+        try:
+            result_auto_assign = await auto_assign_reviewer(
+                project_id=project_id,
+                submission_id=submission_id,
+                session=session
+            )
+            await session.commit()
+            logger.info("✅ Submission %s assigned to %s", submission_id, result_auto_assign)
+        except HTTPException as e:
+            logger.warning("⚠️ Auto-assign skipped for submission %s: %s", submission_id, e.detail)
+        except Exception:
+            logger.exception("❌ Auto-assign failed for submission %s", submission_id)
@@ -1,14 +1,59 @@
-import aiobotocore.session, aiobotocore, os
+import aiobotocore.session, aiobotocore, os, asyncio, logging
+from contextlib import AsyncExitStack
+from typing import AsyncIterator
 from aiobotocore.session import AioSession 
+from aiobotocore.config import AioConfig
 from dotenv import load_dotenv
 
 load_dotenv()
+logger = logging.getLogger(__name__)
 
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = os.getenv("AWS_REGION")
 AWS_S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
 
+# S3 requires every multipart part except the last to be at least 5 MiB
+S3_PART_SIZE = 8 * 1024 * 1024
+# Parts of one multipart upload sent at once (also caps buffered memory per upload)
+S3_UPLOAD_CONCURRENCY = int(os.getenv("S3_UPLOAD_CONCURRENCY", "4"))
+# botocore "standard" retries: exponential backoff with jitter on throttling (SlowDown)
+# and transient errors (5xx, RequestTimeout, InternalError); anything else fails at once
+S3_MAX_ATTEMPTS = int(os.getenv("S3_MAX_ATTEMPTS", "5"))
+
+# One S3 client for the whole process so uploads reuse its connection pool
+_s3_client = None
+_s3_client_stack: AsyncExitStack | None = None
+_s3_client_lock = asyncio.Lock()
+
+
+async def get_s3_client():
+    """Return the shared S3 client, creating it on first use."""
+    global _s3_client, _s3_client_stack
+    if _s3_client is None:
+        async with _s3_client_lock:
+            if _s3_client is None:
+                stack = AsyncExitStack()
+                session = aiobotocore.session.AioSession()  # ✅ use AioSession
+                _s3_client = await stack.enter_async_context(
+                    session.create_client(
+                        "s3",
+                        region_name=AWS_REGION,
+                        aws_access_key_id=AWS_ACCESS_KEY_ID,
+                        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+                        config=AioConfig(retries={"total_max_attempts": S3_MAX_ATTEMPTS, "mode": "standard"}),
+                    )
+                )
+                _s3_client_stack = stack
+    return _s3_client
+
+
+async def close_s3_client():
+    """Close the shared S3 client (called on application shutdown)."""
+    global _s3_client, _s3_client_stack
+    if _s3_client_stack is not None:
+        await _s3_client_stack.aclose()
+    _s3_client, _s3_client_stack = None, None
 
 
 async def upload_file_to_s3(file_content: bytes, file_name: str, content_type: str) -> str | None:
@@ -23,23 +68,122 @@ async def upload_file_to_s3(file_content: bytes, file_name: str, content_type: s
     Returns:
         str | None: Public S3 URL if successful, None otherwise.
     """
-    session = aiobotocore.session.AioSession()  # ✅ use AioSession
+    if len(file_content) > S3_PART_SIZE:
+        # Large payloads go up as concurrent multipart parts instead of one stream
+        view = memoryview(file_content)
+
+        async def parts():
+            for start in range(0, len(view), S3_PART_SIZE):
+                yield view[start:start + S3_PART_SIZE]
+
+        return await upload_stream_to_s3(parts(), file_name, content_type)
+
     try:
-        async with session.create_client(
-            "s3",
-            region_name=AWS_REGION,
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-
-        ) as client:
-            response = await client.put_object(
-                Bucket=AWS_S3_BUCKET_NAME,
-                Key=file_name,
-                Body=file_content,
-                ContentType=content_type,
-            )
-            if response['ResponseMetadata']['HTTPStatusCode'] == 200:
-                return f"https://{AWS_S3_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/{file_name}"
+        client = await get_s3_client()
+        response = await client.put_object(
+            Bucket=AWS_S3_BUCKET_NAME,
+            Key=file_name,
+            Body=file_content,
+            ContentType=content_type,
+        )
+        if response['ResponseMetadata']['HTTPStatusCode'] == 200:
+            return f"https://{AWS_S3_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/{file_name}"
+    except Exception as e:
+        logger.error("[S3 Upload Error] %s: %s", file_name, e)
+    return None
+
+
+
+async def upload_stream_to_s3(chunks: AsyncIterator[bytes], file_name: str, content_type: str) -> str | None:
+    """
+    Stream a file to S3 without holding it in memory, and return the public URL.
+
+    Chunks are gathered into S3_PART_SIZE parts and sent as a multipart upload, up to
+    S3_UPLOAD_CONCURRENCY parts at a time, so memory per upload stays around that many
+    parts whatever the file size. Files smaller than one part go up with a single put_object.
+
+    Args:
+        chunks (AsyncIterator[bytes]): File content, chunk by chunk.
+        file_name (str): Full S3 key (can include folder prefix).
+        content_type (str): MIME type of the file (e.g., audio/mpeg, image/png).
+
+    Returns:
+        str | None: Public S3 URL if successful, None otherwise.
+    """
+    try:
+        client = await get_s3_client()
+        buffer = bytearray()
+        upload_id = None
+        part_uploads: list[asyncio.Task] = []
+        slots = asyncio.Semaphore(S3_UPLOAD_CONCURRENCY)
+
+        async def upload_part(part_number: int, body: bytes) -> dict:
+            try:
+                response = await client.upload_part(
+                    Bucket=AWS_S3_BUCKET_NAME,
+                    Key=file_name,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+            finally:
+                slots.release()
+            return {"ETag": response["ETag"], "PartNumber": part_number}
+
+        async def send_part():
+            # Waits while S3_UPLOAD_CONCURRENCY parts are in flight
+            await slots.acquire()
+            for task in part_uploads:
+                # Stop reading the body as soon as an earlier part has failed
+                if task.done() and task.exception():
+                    slots.release()
+                    raise task.exception()
+            part_uploads.append(asyncio.create_task(upload_part(len(part_uploads) + 1, bytes(buffer))))
+            buffer.clear()
+
+        try:
+            async for chunk in chunks:
+                buffer.extend(chunk)
+                if len(buffer) >= S3_PART_SIZE:
+                    if upload_id is None:
+                        created = await client.create_multipart_upload(
+                            Bucket=AWS_S3_BUCKET_NAME,
+                            Key=file_name,
+                            ContentType=content_type,
+                        )
+                        upload_id = created["UploadId"]
+                    await send_part()
+
+            if upload_id is None:
+                response = await client.put_object(
+                    Bucket=AWS_S3_BUCKET_NAME,
+                    Key=file_name,
+                    Body=bytes(buffer),
+                    ContentType=content_type,
+                )
+            else:
+                if buffer:
+                    await send_part()
+                parts = await asyncio.gather(*part_uploads)
+                response = await client.complete_multipart_upload(
+                    Bucket=AWS_S3_BUCKET_NAME,
+                    Key=file_name,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+        except BaseException:
+            for task in part_uploads:
+                task.cancel()
+            await asyncio.gather(*part_uploads, return_exceptions=True)
+            # Don't leave orphaned parts around (S3 bills for them)
+            if upload_id is not None:
+                await client.abort_multipart_upload(
+                    Bucket=AWS_S3_BUCKET_NAME, Key=file_name, UploadId=upload_id
+                )
+            raise
+
+        if response['ResponseMetadata']['HTTPStatusCode'] == 200:
+            return f"https://{AWS_S3_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/{file_name}"
     except Exception as e:
-        print(f"[S3 Upload Error] {e}")
+        logger.error("[S3 Upload Error] %s: %s", file_name, e)
     return None
@@ -9,8 +9,10 @@ def get_effective_payload_text(submission: Optional[Submission], prompt: Optiona
       2. prompt.text (if available)
       3. None
     """
-    if submission and submission.payload_text and submission.payload_text.strip() != "":
-        return submission.payload_text
+    text = submission.payload_text if submission else None
+    # isspace() tests for whitespace-only without allocating a stripped copy
+    if text and not text.isspace():
+        return text
     if prompt and prompt.text:
         return prompt.text
     return None
@@ -1,19 +1,52 @@
+import asyncio
+import logging
 import pandas as pd
 from sqlmodel import Session, select
 from fastapi import HTTPException, UploadFile
 from src.db.models import User, Role
-from src.utils.auth import get_password_hash
+from src.utils.auth import get_password_hash_async
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from typing import Optional
+from src.utils.cache import TTLCache
+from src.schemas.user_schemas import UserResponse
+
+logger = logging.getLogger(__name__)
+
+# Read-only user lookups by email (Telegram bot polls these on every tick).
+# Anything that changes a user must call invalidate_cached_user().
+user_by_email_cache = TTLCache(ttl=30)
+
+# Rows per lookup/INSERT when importing users from a sheet
+USER_UPLOAD_BATCH_SIZE = 1000
+
+
+async def get_cached_user_by_email(session: AsyncSession, email: str) -> Optional[UserResponse]:
+    """Return a read-only snapshot of the user with this email, from cache when fresh."""
+    user = user_by_email_cache.get(email)
+    if user is None:
+        result = await session.execute(select(User).where(User.email == email))
+        db_user = result.scalars().first()
+        if not db_user:
+            return None
+        user = UserResponse.model_validate(db_user)
+        user_by_email_cache.set(email, user)
+    return user
+
+
+def invalidate_cached_user(*emails: Optional[str]) -> None:
+    """Drop cached snapshots for these emails after the user row changes."""
+    user_by_email_cache.delete(*(e for e in emails if e))
+
 
 async def create_user_in_db(session: AsyncSession, user: User) -> User:
     """Reusable function to create and persist a user."""
-    existing_result = await session.execute(select(User).where(User.email == user.email))
-    existing = existing_result.scalars().first()
+    existing = await session.scalar(select(User.id).where(User.email == user.email).limit(1))
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     if user.password:
-        user.password = get_password_hash(user.password)
+        user.password = await get_password_hash_async(user.password)
 
     session.add(user)
     await session.commit()
@@ -26,7 +59,8 @@ async def create_user_in_db(session: AsyncSession, user: User) -> User:
 async def process_excel_users(session: AsyncSession, file: UploadFile):
     """Read and create users from Excel file upload."""
     try:
-        df = pd.read_excel(file.file, engine="openpyxl")
+        # pandas opens the workbook read-only (rows are streamed); keep the parse off the event loop
+        df = await asyncio.to_thread(pd.read_excel, file.file, engine="openpyxl", dtype=str)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error reading Excel file: {e}")
 
@@ -35,55 +69,78 @@ async def process_excel_users(session: AsyncSession, file: UploadFile):
     if not all(c in df.columns for c in required):
         raise HTTPException(status_code=400, detail=f"Required columns: {required}")
 
-    created = 0
+    def column(name: str) -> list[Optional[str]]:
+        """Whole column at once: stripped strings, blank or missing cells as None."""
+        if name not in df.columns:
+            return [None] * len(df)
+        values = df[name].str.strip().astype(object)
+        return values.where(values.notna() & (values != ""), None).tolist()
+
+    def split_csv(value: Optional[str]) -> list[str]:
+        return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+    roles = {role.value: role for role in Role}
+    rows = []
+    passwords = []
+    for name, email, role_str, telegram_id, language, dialect, password in zip(
+        column("name"), column("email"), column("role"), column("telegram_id"),
+        column("language"), column("dialect"), column("password"),
+    ):
+        if not email:
+            continue
+        rows.append({
+            "name": name,
+            "email": email,
+            "role": roles.get(role_str or "agent", Role.agent),
+            "telegram_id": telegram_id,
+            "languages": split_csv(language),
+            "dialects": split_csv(dialect),
+        })
+        passwords.append(password)
+
+    # bcrypt is CPU-bound: hashed in parallel, off the event loop
+    async def hash_or_none(password: Optional[str]) -> Optional[str]:
+        return await get_password_hash_async(password) if password else None
+
+    # Batches keep each IN list / multi-row INSERT under Postgres' bind parameter limit
     created_users = []
-
-    for _, row in df.iterrows():
-        email = str(row["email"]).strip()
-        existing_result = await session.execute(select(User).where(User.email == email))
-        existing = existing_result.scalars().first()
-        if existing:
+    seen = set()
+    for start in range(0, len(rows), USER_UPLOAD_BATCH_SIZE):
+        batch_rows = rows[start:start + USER_UPLOAD_BATCH_SIZE]
+        batch_passwords = passwords[start:start + USER_UPLOAD_BATCH_SIZE]
+
+        # One lookup per batch: rows for existing emails (or repeated in the sheet)
+        # would be skipped by the INSERT anyway, so don't spend bcrypt on them
+        seen.update((await session.scalars(
+            select(User.email).where(User.email.in_({row["email"] for row in batch_rows}))
+        )).all())
+        new_rows, new_passwords = [], []
+        for row, password in zip(batch_rows, batch_passwords):
+            if row["email"] in seen:
+                continue
+            seen.add(row["email"])
+            new_rows.append(row)
+            new_passwords.append(password)
+        if not new_rows:
             continue
 
+        hashes = await asyncio.gather(*(hash_or_none(p) for p in new_passwords))
+        for row, hashed_password in zip(new_rows, hashes):
+            row["password"] = hashed_password
 
-        # Safely get and split comma-separated strings
-        languages_str = str(row.get("language", "")).strip()
-        languages_list = [lang.strip() for lang in languages_str.split(",") if lang.strip()] if languages_str else []
-
-        dialects_str = str(row.get("dialect", "")).strip()
-        dialects_list = [d.strip() for d in dialects_str.split(",") if d.strip()] if dialects_str else []
-
-        # Password
-        raw_password = row.get("password")
-        print(f"Raw password: {raw_password}")
-        password = str(raw_password).strip() if raw_password and pd.notna(raw_password) else None
-        hashed_password = get_password_hash(password) if password else None
-        
-
-        role_str = row.get("role", "agent")
-        try:
-            role_enum = Role(role_str)
-        except ValueError:
-            role_enum = Role.agent
-
-        user = User(
-            name=str(row["name"]).strip(),
-            email=email,
-            role=role_enum,
-            password=hashed_password,
-            telegram_id=row.get("telegram_id", None),
-            languages=languages_list,
-            dialects=dialects_list,
+        # One INSERT per batch; ON CONFLICT still covers users created meanwhile
+        stmt = (
+            insert(User)
+            .values(new_rows)
+            .on_conflict_do_nothing(index_elements=["email"], index_where=User.email.isnot(None))
+            .returning(User)
         )
-        session.add(user)
-        await session.flush()
-        created += 1
-        created_users.append(user)
+        created_users.extend((await session.scalars(stmt)).all())
 
     await session.commit()
-    
-    print(f"Created {created} users")
+
+    logger.info("Created %d users", len(created_users))
     return {
-        "count": created, 
+        "count": len(created_users), 
         "users": created_users
     }